@@ -3,11 +3,12 @@ import matplotlib.pyplot as plt
 import time
 import random
 from matplotlib.animation import FuncAnimation
-
-# Variáveis globais para os parâmetros do gráfico
-melhores_fitness = []
-fitness_medio = []
-populacoes_geracoes = []
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # funcoes_benchmark.py fica na raiz do repositório
+from funcoes_benchmark import FUNCOES, DOMINIOS
+from historico_frames import HistoricoFrames
+from nucleo_ag import selecao_torneio_vetorizada, recombinacao_blx_vetorizada
 
 # Função Alpine2
 def alpine2(x):
@@ -21,6 +22,10 @@ def populacao_inicial(tamanho_populacao, num_dimensoes):
 def fitness(individuo):
     return alpine2(individuo)
 
+# Função para calcular o fitness de toda a população em uma única chamada
+def fitness_lote(populacao):
+    return FUNCOES['alpine2'](np.asarray(populacao))
+
 # Função para fazer a seleção dos pais (torneio)
 def selecao_torneio(populacao, tamanho_torneio):
     pais = []
@@ -30,13 +35,14 @@ def selecao_torneio(populacao, tamanho_torneio):
         pais.append(torneio[0])
     return pais
 
-# Função para cruzar dois indivíduos (crossover BLX‑α)
+# Função para cruzar dois indivíduos (crossover BLX‑α). O filho é limitado ao domínio: fora dele a raiz de alpine2
+# não existe e o fitness seria NaN
 def recombinacao(pai1, pai2, alfa=0.3):
     p1, p2 = np.array(pai1), np.array(pai2)
     d = np.abs(p1 - p2)
     menor = np.minimum(p1, p2) - alfa * d
     maior = np.maximum(p1, p2) + alfa * d
-    return np.random.uniform(menor, maior)
+    return np.clip(np.random.uniform(menor, maior), *DOMINIOS['alpine2'])
 
 # Função para aplicar mutação em um indivíduo (perturbação gaussiana)
 def mutacao(individuo, taxa_mutacao, sigma=0.5):
@@ -56,22 +62,69 @@ def nova_geracao(populacao, taxa_mutacao, tamanho_torneio):
         nova_populacao.append(filho_mutado)
     return nova_populacao
 
-# Função principal do Algoritmo Genético
-def algoritmo_genetico(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio):
+# Função principal do Algoritmo Genético. Não usa estado global: devolve a melhor solução e as curvas do melhor fitness
+# e do fitness médio de cada geração; populacoes_geracoes (HistoricoFrames, opcional) recebe as populações da execução
+def algoritmo_genetico(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes=None):
+    melhores_fitness = []
+    fitness_medio = []
     populacao = populacao_inicial(tamanho_populacao, num_dimensoes)
 
-    for _ in range(num_geracoes):
+    for geracao in range(num_geracoes):
         populacao = nova_geracao(populacao, taxa_mutacao, tamanho_torneio)
-        # Salva a população de cada geração
-        populacoes_geracoes.append(populacao)
+        # Salva a população da geração (conforme o intervalo do histórico)
+        if populacoes_geracoes is not None:
+            populacoes_geracoes.registra(geracao, populacao)
 
         # Calcula o fitness máximo e médio da população
-        fitness_geracao = [fitness(individuo) for individuo in populacao]
-        melhores_fitness.append(max(fitness_geracao))
-        fitness_medio.append(sum(fitness_geracao) / len(fitness_geracao))
-
-    melhor_solucao = max(populacao, key=fitness)
-    return melhor_solucao
+        fitness_geracao = fitness_lote(populacao)
+        melhores_fitness.append(np.max(fitness_geracao))
+        fitness_medio.append(np.mean(fitness_geracao))
+
+    if populacoes_geracoes is not None:
+        populacoes_geracoes.finaliza()
+    melhor_solucao = populacao[np.argmax(fitness_lote(populacao))]
+    return melhor_solucao, melhores_fitness, fitness_medio
+
+# Versão vetorizada: a população é uma matriz (indivíduos x dimensões) e cada etapa da geração opera sobre ela inteira
+
+# Função para definir a população inicial (matriz, aleatoriamente)
+def populacao_inicial_vetorizada(tamanho_populacao, num_dimensoes):
+    return np.random.uniform(*DOMINIOS['alpine2'], (tamanho_populacao, num_dimensoes))
+
+# Função para aplicar mutação em todos os indivíduos (perturbação gaussiana nos genes sorteados). Todos os genes são
+# limitados ao domínio, inclusive os que vieram do BLX‑α sem mutação (fora do domínio a raiz de alpine2 não existe)
+def mutacao_vetorizada(populacao, taxa_mutacao, sigma=0.5):
+    mascara = np.random.random(populacao.shape) < taxa_mutacao
+    populacao = populacao + mascara * np.random.normal(0, sigma, populacao.shape)
+    return np.clip(populacao, *DOMINIOS['alpine2'])
+
+# Função para criar a nova geração (devolve também o fitness da nova geração, calculado uma única vez)
+def nova_geracao_vetorizada(populacao, fitness_populacao, taxa_mutacao, tamanho_torneio):
+    pares = selecao_torneio_vetorizada(fitness_populacao, len(populacao), tamanho_torneio)
+    filhos = recombinacao_blx_vetorizada(populacao[pares[:, 0]], populacao[pares[:, 1]])
+    filhos = mutacao_vetorizada(filhos, taxa_mutacao)
+    return filhos, fitness_lote(filhos)
+
+# Função principal do Algoritmo Genético (versão vetorizada, mesmas entradas e saídas da versão com listas)
+def algoritmo_genetico_vetorizado(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes=None):
+    populacao = populacao_inicial_vetorizada(tamanho_populacao, num_dimensoes)
+    fitness_geracao = fitness_lote(populacao)
+    melhores_fitness = []
+    fitness_medio = []
+
+    for geracao in range(num_geracoes):
+        populacao, fitness_geracao = nova_geracao_vetorizada(populacao, fitness_geracao, taxa_mutacao, tamanho_torneio)
+        # Salva a população da geração (conforme o intervalo do histórico)
+        if populacoes_geracoes is not None:
+            populacoes_geracoes.registra(geracao, populacao)
+
+        # Fitness máximo e médio da população (reaproveita o fitness da nova geração)
+        melhores_fitness.append(np.max(fitness_geracao))
+        fitness_medio.append(np.mean(fitness_geracao))
+
+    if populacoes_geracoes is not None:
+        populacoes_geracoes.finaliza()
+    return populacao[np.argmax(fitness_geracao)], melhores_fitness, fitness_medio
 
 if __name__ == "__main__":
     # Definindo os parâmetros do algoritmo genético
@@ -80,11 +133,23 @@ if __name__ == "__main__":
     num_geracoes = 40
     taxa_mutacao = 0.1
     tamanho_torneio = 3
+    vetorizado = True  # População em uma matriz NumPy, geração inteira de uma vez
+    # Histórico das populações para a animação: 'memoria', 'anel', 'memmap' ou 'npz' (ver historico_frames.py)
+    modo_historico = 'memoria'
+    intervalo_historico = 1  # Guarda uma população a cada intervalo_historico gerações
+    frames_anel = 20  # Modo 'anel': guarda só as últimas frames_anel populações
+
+    arquivo_historico = 'historico_populacoes.npz' if modo_historico == 'npz' else 'historico_populacoes.npy'
+    capacidade_historico = frames_anel if modo_historico == 'anel' else num_geracoes // intervalo_historico + 1
+    populacoes_geracoes = HistoricoFrames(modo_historico, intervalo_historico, capacidade_historico, arquivo_historico)
 
     inicio = time.time() # marca o tempo de execução
 
     # Executando o algoritmo genético
-    melhor_solucao = algoritmo_genetico(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio)
+    if vetorizado:
+        melhor_solucao, melhores_fitness, fitness_medio = algoritmo_genetico_vetorizado(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes)
+    else:
+        melhor_solucao, melhores_fitness, fitness_medio = algoritmo_genetico(tamanho_populacao, num_dimensoes, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes)
 
     fim = time.time() # marca o tempo de execução
 
@@ -123,12 +188,12 @@ if __name__ == "__main__":
         x1 = [ind[0] for ind in ger]
         x2 = [ind[1] for ind in ger]
         pontos.set_data(x1, x2)
-        ax.set_title(f'Geração {frame+1} de {num_geracoes}')
+        ax.set_title(f'Geração {populacoes_geracoes.iteracoes[frame]+1} de {num_geracoes}')
         return pontos,
 
     # Monta e salva a animação
     anim = FuncAnimation(fig, atualizar,
-                         frames=num_geracoes,
+                         frames=len(populacoes_geracoes),
                          interval=200,
                          blit=False)
     anim.save('evolucao_individuos.mp4', writer='ffmpeg', dpi=200)
@@ -1,6 +1,14 @@
 import csv
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # utilitarios.py fica na raiz do repositório
+from utilitarios import cria_memoria_compartilhada, executa_com_memoria_compartilhada, libera_memoria_compartilhada
 
 # Le arquivo CSV e preenche a matriz de distâncias
 def preenche_matriz_dist(arq):
@@ -11,6 +19,20 @@ def preenche_matriz_dist(arq):
             matriz.append(linha)
     return matriz
 
+# Carrega a matriz de distâncias como ndarray numérico. O CSV é convertido uma única vez e salvo em cache
+# (.npy ao lado do CSV); nas execuções seguintes o cache é mapeado em memória, sem reler o texto
+def carrega_matriz_dist(arq, dtype=np.float64):
+    base, _ = os.path.splitext(arq)
+    arq_cache = f"{base}.{np.dtype(dtype).name}.npy"
+
+    # Usa o cache apenas se ele for mais recente que o CSV
+    if os.path.exists(arq_cache) and os.path.getmtime(arq_cache) >= os.path.getmtime(arq):
+        return np.load(arq_cache, mmap_mode='r')
+
+    matriz = np.loadtxt(arq, delimiter=',', dtype=dtype, ndmin=2)
+    np.save(arq_cache, matriz)
+    return np.load(arq_cache, mmap_mode='r')
+
 # Inicializa nível de feromônio como 1 para todas as arestas
 def inicializa_feromonio(num_cidades):
     return np.ones((num_cidades, num_cidades))
@@ -55,54 +77,488 @@ def atualiza_nivel_feromonio(matriz_feromonio, num_cidades, taxa_evaporacao, mat
 
     return matriz_feromonio
 
-# Algoritmo de Colônia de Formigas para o problema do Caixeiro Viajante
-def algoritmo_ant_colony(matriz_dist, num_cidades, num_formigas, matriz_feromonio, num_iteracoes):
-    melhor_caminho = None
-    melhor_distancia = float('inf')
+# Deposita o feromônio ao longo das arestas percorridas pelas formigas (nos dois sentidos), somando direto na
+# matriz de feromônio, sem criar uma matriz n×n de depósito por formiga
+def deposita_feromonio(matriz_feromonio, caminhos, feromonio_excretado, matriz_dist):
+    caminhos = np.atleast_2d(caminhos)
+    origens = caminhos[:, :-1].ravel()
+    destinos = caminhos[:, 1:].ravel()
+    np.add.at(matriz_feromonio, (origens, destinos), feromonio_excretado / matriz_dist[origens, destinos])
+    np.add.at(matriz_feromonio, (destinos, origens), feromonio_excretado / matriz_dist[destinos, origens])
+
+# Atualiza o feromônio no próprio array: evaporação em uma única operação e depósito apenas nas arestas dos caminhos
+def atualiza_feromonio_incremental(matriz_feromonio, caminhos, melhor_caminho, taxa_evaporacao, feromonio_excretado, parametro_elitismo, matriz_dist):
+    matriz_feromonio *= taxa_evaporacao
+    deposita_feromonio(matriz_feromonio, caminhos, feromonio_excretado, matriz_dist)
+    # Elitismo: reforça o melhor caminho global
+    deposita_feromonio(matriz_feromonio, melhor_caminho, feromonio_excretado * parametro_elitismo, matriz_dist)
+    return matriz_feromonio
+
+# Constrói o caminho de uma formiga, escolhendo uma cidade por vez
+def constroi_caminho(matriz_dist, matriz_feromonio, num_cidades):
+    caminho = []
+    cidades_nao_visitadas = list(range(num_cidades))
+    cidade_atual = np.random.choice(cidades_nao_visitadas)
+    caminho.append(cidade_atual)
+    cidades_nao_visitadas.remove(cidade_atual)
+
+    while cidades_nao_visitadas:
+        prob_transicao = calcula_prob_transicao(matriz_dist, matriz_feromonio, cidade_atual, cidades_nao_visitadas)
+        prob_cidades_nao_visitadas = prob_transicao[cidades_nao_visitadas] # Seleciona apenas as probabilidades das cidades não visitadas
+        prob_cidades_nao_visitadas = prob_cidades_nao_visitadas / prob_cidades_nao_visitadas.sum()
+        proxima_cidade = np.random.choice(cidades_nao_visitadas, p=prob_cidades_nao_visitadas)
+        caminho.append(proxima_cidade)
+        cidades_nao_visitadas.remove(proxima_cidade)
+        cidade_atual = proxima_cidade
+
+    return caminho
+
+# Pré-calcula a matriz heurística (1 / distância), com zero onde a distância é nula
+def calcula_matriz_heuristica(matriz_dist):
+    dist = np.asarray(matriz_dist)
+    if not np.issubdtype(dist.dtype, np.floating):
+        dist = dist.astype(float)
+    matriz_heuristica = np.zeros_like(dist)
+    np.divide(1.0, dist, out=matriz_heuristica, where=dist > 0)
+    return matriz_heuristica
+
+# Constrói os caminhos de todas as formigas ao mesmo tempo, usando uma máscara de cidades visitadas
+def constroi_caminhos_vetorizado(matriz_heuristica, matriz_feromonio, num_formigas):
+    num_cidades = len(matriz_heuristica)
+    atratividade = matriz_feromonio * matriz_heuristica  # feromônio / distância, calculado uma vez por iteração
+
+    # Sorteia os números aleatórios na mesma ordem da versão sequencial (cidade inicial e depois cada passo,
+    # formiga por formiga), assim a mesma semente gera os mesmos caminhos
+    inicios = np.empty(num_formigas, dtype=int)
+    sorteios = np.empty((num_formigas, num_cidades - 1))
+    for k in range(num_formigas):
+        inicios[k] = np.random.randint(num_cidades)
+        sorteios[k] = np.random.random_sample(num_cidades - 1)
+
+    formigas = np.arange(num_formigas)
+    caminhos = np.empty((num_formigas, num_cidades), dtype=int)
+    nao_visitadas = np.ones((num_formigas, num_cidades), dtype=bool)
+    cidade_atual = inicios
+    caminhos[:, 0] = cidade_atual
+    nao_visitadas[formigas, cidade_atual] = False
+
+    for passo in range(1, num_cidades):
+        pesos = atratividade[cidade_atual] * nao_visitadas
+        soma = pesos.sum(axis=1, keepdims=True)
+        pesos = np.where(soma > 0, pesos, nao_visitadas)  # Sem atratividade: sorteio uniforme entre as não visitadas
+
+        proxima_cidade = roleta_vetorizada(pesos, sorteios[:, passo - 1])  # Mesmo critério do np.random.choice
+
+        caminhos[:, passo] = proxima_cidade
+        nao_visitadas[formigas, proxima_cidade] = False
+        cidade_atual = proxima_cidade
+
+    return caminhos
+
+# Pré-calcula a lista de candidatos: as k cidades mais próximas de cada cidade, em ordem de distância.
+# Usa uma k-d tree quando as coordenadas das cidades estão disponíveis; caso contrário, usa a matriz de distâncias
+def calcula_lista_candidatos(matriz_dist, num_candidatos, coordenadas=None, tamanho_bloco=1024):
+    num_cidades = len(matriz_dist)
+    num_candidatos = min(num_candidatos, num_cidades - 1)
+
+    if coordenadas is not None:
+        from scipy.spatial import cKDTree
+        _, vizinhos = cKDTree(coordenadas).query(coordenadas, k=num_candidatos + 1)
+        # Remove a própria cidade (que pode não estar na primeira coluna se houver cidades repetidas)
+        manter = vizinhos != np.arange(num_cidades)[:, None]
+        manter[manter.all(axis=1), -1] = False
+        return vizinhos[manter].reshape(num_cidades, num_candidatos)
+
+    # Processa a matriz em blocos de linhas para não duplicar matrizes grandes na memória
+    lista_candidatos = np.empty((num_cidades, num_candidatos), dtype=int)
+    for inicio in range(0, num_cidades, tamanho_bloco):
+        bloco = np.array(matriz_dist[inicio:inicio + tamanho_bloco], dtype=float)
+        linhas = np.arange(len(bloco))
+        bloco[linhas, inicio + linhas] = np.inf  # Ignora a própria cidade
+        vizinhos = np.argpartition(bloco, num_candidatos - 1, axis=1)[:, :num_candidatos]
+        ordem = np.argsort(np.take_along_axis(bloco, vizinhos, axis=1), axis=1)
+        lista_candidatos[inicio:inicio + len(bloco)] = np.take_along_axis(vizinhos, ordem, axis=1)
+    return lista_candidatos
+
+# Roleta vetorizada: para cada formiga, índice da primeira coluna cuja probabilidade acumulada ultrapassa o sorteio
+def roleta_vetorizada(pesos, sorteios):
+    acumulado = np.cumsum(pesos, axis=1)
+    acumulado /= acumulado[:, -1:]
+    return np.sum(acumulado <= sorteios[:, None], axis=1)
+
+# Constrói os caminhos de todas as formigas escolhendo apenas entre as cidades candidatas da cidade atual.
+# Quando todas as candidatas já foram visitadas, a formiga escolhe entre todas as cidades não visitadas
+def constroi_caminhos_candidatos(matriz_dist, matriz_feromonio, lista_candidatos, heuristica_candidatos, num_formigas):
+    num_cidades = len(matriz_dist)
+
+    # Mesma ordem de sorteios da construção sequencial
+    inicios = np.empty(num_formigas, dtype=int)
+    sorteios = np.empty((num_formigas, num_cidades - 1))
+    for k in range(num_formigas):
+        inicios[k] = np.random.randint(num_cidades)
+        sorteios[k] = np.random.random_sample(num_cidades - 1)
+
+    formigas = np.arange(num_formigas)
+    caminhos = np.empty((num_formigas, num_cidades), dtype=int)
+    nao_visitadas = np.ones((num_formigas, num_cidades), dtype=bool)
+    cidade_atual = inicios
+    caminhos[:, 0] = cidade_atual
+    nao_visitadas[formigas, cidade_atual] = False
+
+    for passo in range(1, num_cidades):
+        candidatas = lista_candidatos[cidade_atual]
+        disponiveis = nao_visitadas[formigas[:, None], candidatas]
+        pesos = matriz_feromonio[cidade_atual[:, None], candidatas] * heuristica_candidatos[cidade_atual] * disponiveis
+        com_candidatas = pesos.sum(axis=1) > 0
+
+        proxima_cidade = np.empty(num_formigas, dtype=int)
+        escolha = roleta_vetorizada(pesos[com_candidatas], sorteios[com_candidatas, passo - 1])
+        proxima_cidade[com_candidatas] = candidatas[com_candidatas, escolha]
+
+        # Formigas sem candidatas disponíveis escolhem entre todas as cidades não visitadas
+        sem_candidatas = np.flatnonzero(~com_candidatas)
+        if len(sem_candidatas) > 0:
+            atuais = cidade_atual[sem_candidatas]
+            pesos_todas = matriz_feromonio[atuais] * calcula_matriz_heuristica(matriz_dist[atuais]) * nao_visitadas[sem_candidatas]
+            pesos_todas = np.where(pesos_todas.sum(axis=1, keepdims=True) > 0, pesos_todas, nao_visitadas[sem_candidatas])
+            proxima_cidade[sem_candidatas] = roleta_vetorizada(pesos_todas, sorteios[sem_candidatas, passo - 1])
+
+        caminhos[:, passo] = proxima_cidade
+        nao_visitadas[formigas, proxima_cidade] = False
+        cidade_atual = proxima_cidade
+
+    return caminhos
+
+# Calcula a distância total dos caminhos de todas as formigas de uma vez
+def calcula_distancias_vetorizado(matriz_dist, caminhos):
+    return matriz_dist[caminhos, np.roll(caminhos, -1, axis=1)].sum(axis=1)
+
+# Inverte o trecho do caminho entre as posições inicio e fim (inclusive, no sentido do caminho, de forma circular).
+# Quando o trecho complementar é menor, inverte ele no lugar, o que gera o mesmo ciclo
+def inverte_trecho(caminho, posicoes, inicio, fim):
+    num_cidades = len(caminho)
+    tamanho = (fim - inicio) % num_cidades + 1
+    if 2 * tamanho > num_cidades:
+        inicio, fim = (fim + 1) % num_cidades, (inicio - 1) % num_cidades
+        tamanho = num_cidades - tamanho
+    indices = (inicio + np.arange(tamanho)) % num_cidades
+    caminho[indices] = caminho[indices[::-1]]
+    posicoes[caminho[indices]] = indices
+
+# 2-opt com listas de vizinhos e don't-look bits: troca as arestas (a, a') e (c, c') por (a, c) e (a', c'),
+# onde c é um vizinho próximo de a. Só a variação do comprimento é calculada (distâncias simétricas)
+def busca_local_2opt(caminho, distancia, matriz_dist, lista_vizinhos):
+    caminho = np.array(caminho)
+    num_cidades = len(caminho)
+    posicoes = np.empty(num_cidades, dtype=int)
+    posicoes[caminho] = np.arange(num_cidades)
+
+    # Don't-look bits: só as cidades na fila são examinadas; uma cidade volta à fila quando uma aresta sua muda
+    fila = deque(caminho.tolist())
+    na_fila = np.ones(num_cidades, dtype=bool)
+
+    while fila:
+        a = fila.popleft()
+        na_fila[a] = False
+        for sentido in (1, -1):
+            i = posicoes[a]
+            a_viz = caminho[(i + sentido) % num_cidades]
+            dist_a = matriz_dist[a, a_viz]
+            movimento = None
+            for c in lista_vizinhos[a]:
+                dist_ac = matriz_dist[a, c]
+                if dist_ac >= dist_a:
+                    break  # Vizinhos em ordem de distância: nenhum dos próximos traz ganho
+                j = posicoes[c]
+                c_viz = caminho[(j + sentido) % num_cidades]
+                delta = dist_ac + matriz_dist[a_viz, c_viz] - dist_a - matriz_dist[c, c_viz]
+                if delta < -1e-9:
+                    movimento = (j, c, c_viz, delta)
+                    break
+            if movimento is not None:
+                j, c, c_viz, delta = movimento
+                if sentido == 1:
+                    inverte_trecho(caminho, posicoes, i + 1, j)
+                else:
+                    inverte_trecho(caminho, posicoes, i, j - 1)
+                distancia += delta
+                for cidade in (a, a_viz, c, c_viz):
+                    if not na_fila[cidade]:
+                        fila.append(cidade)
+                        na_fila[cidade] = True
+                break
+
+    return caminho.tolist(), distancia
+
+# Or-opt com listas de vizinhos e don't-look bits: move um trecho de até tamanho_max_trecho cidades, começando em a,
+# para junto de uma cidade c vizinha de a (nas duas orientações). Só a variação do comprimento é calculada
+def busca_local_or_opt(caminho, distancia, matriz_dist, lista_vizinhos, tamanho_max_trecho=3):
+    caminho = np.array(caminho)
+    num_cidades = len(caminho)
+    posicoes = np.empty(num_cidades, dtype=int)
+    posicoes[caminho] = np.arange(num_cidades)
+
+    fila = deque(caminho.tolist())
+    na_fila = np.ones(num_cidades, dtype=bool)
+
+    while fila:
+        a = fila.popleft()
+        na_fila[a] = False
+        movimento = None
+        for sentido in (1, -1):
+            i = posicoes[a]
+            for tamanho in range(1, min(tamanho_max_trecho, num_cidades - 3) + 1):
+                trecho = caminho[(i + sentido * np.arange(tamanho)) % num_cidades]
+                anterior = caminho[(i - sentido) % num_cidades]
+                proxima = caminho[(i + sentido * tamanho) % num_cidades]
+                ultima = trecho[-1]
+                ganho_remocao = matriz_dist[anterior, a] + matriz_dist[ultima, proxima] - matriz_dist[anterior, proxima]
+                for c in lista_vizinhos[a]:
+                    if matriz_dist[a, c] >= ganho_remocao:
+                        break
+                    if c in trecho:
+                        continue
+                    # Vizinhos de c no caminho já sem o trecho
+                    c_depois = proxima if c == anterior else caminho[(posicoes[c] + sentido) % num_cidades]
+                    c_antes = anterior if c == proxima else caminho[(posicoes[c] - sentido) % num_cidades]
+                    # c, a ... ultima, c_depois
+                    if c != anterior:
+                        delta = matriz_dist[c, a] + matriz_dist[ultima, c_depois] - matriz_dist[c, c_depois] - ganho_remocao
+                        if delta < -1e-9:
+                            movimento = (sentido, trecho, proxima, c, False, (anterior, proxima, a, ultima, c, c_depois), delta)
+                            break
+                    # c_antes, ultima ... a, c
+                    delta = matriz_dist[c_antes, ultima] + matriz_dist[a, c] - matriz_dist[c_antes, c] - ganho_remocao
+                    if delta < -1e-9:
+                        movimento = (sentido, trecho, proxima, c, True, (anterior, proxima, a, ultima, c, c_antes), delta)
+                        break
+                if movimento is not None:
+                    break
+            if movimento is not None:
+                break
+
+        if movimento is not None:
+            sentido, trecho, proxima, c, invertido, alteradas, delta = movimento
+            # Caminho sem o trecho, começando na cidade seguinte a ele (percorrido no mesmo sentido)
+            restante = caminho[(posicoes[proxima] + sentido * np.arange(num_cidades - len(trecho))) % num_cidades]
+            k = np.flatnonzero(restante == c)[0]
+            if invertido:
+                caminho = np.concatenate((restante[:k], trecho[::-1], restante[k:]))
+            else:
+                caminho = np.concatenate((restante[:k + 1], trecho, restante[k + 1:]))
+            posicoes[caminho] = np.arange(num_cidades)
+            distancia += delta
+            for cidade in alteradas:
+                if not na_fila[cidade]:
+                    fila.append(cidade)
+                    na_fila[cidade] = True
+
+    return caminho.tolist(), distancia
+
+# Operadores de busca local disponíveis (também é possível passar uma função com a mesma assinatura)
+OPERADORES_BUSCA_LOCAL = {
+    '2-opt': busca_local_2opt,
+    'or-opt': busca_local_or_opt,
+}
+
+# Aplica os operadores de busca local em sequência até nenhum deles encurtar o caminho
+def aplica_busca_local(caminho, distancia, matriz_dist, lista_vizinhos, operadores):
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for operador in operadores:
+            if isinstance(operador, str):
+                operador = OPERADORES_BUSCA_LOCAL[operador]
+            caminho, nova_distancia = operador(caminho, distancia, matriz_dist, lista_vizinhos)
+            if nova_distancia < distancia - 1e-9:
+                melhorou = True
+            distancia = nova_distancia
+    return caminho, distancia
+
+# Algoritmo de Colônia de Formigas para o problema do Caixeiro Viajante.
+# Com num_candidatos, cada formiga escolhe apenas entre as cidades mais próximas da cidade atual (lista de candidatos)
+# Com busca_local (lista de operadores), os num_elite_busca_local melhores caminhos de cada iteração são melhorados
+# antes do depósito de feromônio. (melhor_caminho e melhor_distancia permitem continuar a partir de um melhor caminho já conhecido)
+def algoritmo_ant_colony(matriz_dist, num_cidades, num_formigas, matriz_feromonio, num_iteracoes, vetorizado=False,
+                         num_candidatos=None, coordenadas=None, taxa_evaporacao=0.95, feromonio_excretado=50,
+                         parametro_elitismo=2, melhor_caminho=None, melhor_distancia=float('inf'), busca_local=None,
+                         num_elite_busca_local=1, num_vizinhos_busca_local=10):
     historico_melhor_distancia = [] # Para fazer o gráfico de evolução
 
+    if not isinstance(matriz_dist, np.ndarray):
+        matriz_dist = np.asarray(matriz_dist, dtype=float)  # Matriz lida como texto por preenche_matriz_dist
+    if num_candidatos:
+        lista_candidatos = calcula_lista_candidatos(matriz_dist, num_candidatos, coordenadas)
+        heuristica_candidatos = calcula_matriz_heuristica(matriz_dist[np.arange(num_cidades)[:, None], lista_candidatos])
+    elif vetorizado:
+        matriz_heuristica = calcula_matriz_heuristica(matriz_dist)
+    if busca_local:
+        lista_vizinhos = calcula_lista_candidatos(matriz_dist, num_vizinhos_busca_local, coordenadas)
+
     for _ in range(num_iteracoes):
-        caminhos = []
-        distancias = []
-        for _ in range(num_formigas):
-            caminho = []
-            cidades_nao_visitadas = list(range(num_cidades))
-            cidade_atual = np.random.choice(cidades_nao_visitadas)
-            caminho.append(cidade_atual)
-            cidades_nao_visitadas.remove(cidade_atual)
-
-            while cidades_nao_visitadas:
-                prob_transicao = calcula_prob_transicao(matriz_dist, matriz_feromonio, cidade_atual, cidades_nao_visitadas)
-                prob_cidades_nao_visitadas = prob_transicao[cidades_nao_visitadas] # Seleciona apenas as probabilidades das cidades não visitadas
-                prob_cidades_nao_visitadas = prob_cidades_nao_visitadas / prob_cidades_nao_visitadas.sum()
-                proxima_cidade = np.random.choice(cidades_nao_visitadas, p=prob_cidades_nao_visitadas)
-                caminho.append(proxima_cidade)
-                cidades_nao_visitadas.remove(proxima_cidade)
-                cidade_atual = proxima_cidade
-
-            # Calcula a distância total do caminho
-            distancia_total = calcula_distancia_total(matriz_dist, caminho)
-            caminhos.append(caminho)
-            distancias.append(distancia_total)
-
-            # Atualiza o melhor caminho e distância se necessário
+        if vetorizado or num_candidatos:
+            if num_candidatos:
+                caminhos_formigas = constroi_caminhos_candidatos(matriz_dist, matriz_feromonio, lista_candidatos, heuristica_candidatos, num_formigas)
+            else:
+                caminhos_formigas = constroi_caminhos_vetorizado(matriz_heuristica, matriz_feromonio, num_formigas)
+            distancias = calcula_distancias_vetorizado(matriz_dist, caminhos_formigas).tolist()
+            caminhos = caminhos_formigas.tolist()
+        else:
+            caminhos = [constroi_caminho(matriz_dist, matriz_feromonio, num_cidades) for _ in range(num_formigas)]
+            # Calcula a distância total de cada caminho
+            distancias = [calcula_distancia_total(matriz_dist, caminho) for caminho in caminhos]
+
+        # Busca local nos melhores caminhos da iteração
+        if busca_local:
+            for k in np.argsort(distancias, kind='stable')[:num_elite_busca_local]:
+                caminhos[k], distancias[k] = aplica_busca_local(caminhos[k], distancias[k], matriz_dist, lista_vizinhos, busca_local)
+
+        # Atualiza o melhor caminho e distância se necessário
+        for caminho, distancia_total in zip(caminhos, distancias):
             if distancia_total < melhor_distancia:
                 melhor_distancia = distancia_total
                 melhor_caminho = caminho
             
-        # Soma o depósito de todas as formigas
+        # Evaporação e depósito de todas as formigas (e do melhor caminho global) direto na matriz de feromônio
+        matriz_feromonio = atualiza_feromonio_incremental(matriz_feromonio, caminhos, melhor_caminho, taxa_evaporacao,
+                                                          feromonio_excretado, parametro_elitismo, matriz_dist)
+
+        historico_melhor_distancia.append(melhor_distancia)  # Armazena a melhor distância de cada iteração
+
+    return melhor_caminho, melhor_distancia, historico_melhor_distancia
+
+# Executa algumas iterações de uma colônia do modelo de ilhas em um processo do pool. A matriz de distâncias
+# (somente leitura) e a matriz de feromônio da colônia ficam em memória compartilhada e não são copiadas
+def executa_epoca_colonia(args):
+    (nome_dist, nome_feromonio, num_cidades, num_colonias, colonia, num_formigas, num_iteracoes,
+     estado_aleatorio, melhor_caminho, melhor_distancia, parametros) = args
+
+    def epoca(matriz_dist, feromonios):
+        np.random.set_state(estado_aleatorio)  # Cada colônia mantém sua própria sequência aleatória entre as épocas
+        caminho, distancia, historico = algoritmo_ant_colony(
+            matriz_dist, num_cidades, num_formigas, feromonios[colonia], num_iteracoes,
+            melhor_caminho=melhor_caminho, melhor_distancia=melhor_distancia, **parametros)
+        return caminho, distancia, historico, np.random.get_state()
+
+    return executa_com_memoria_compartilhada(epoca, [(nome_dist, (num_cidades, num_cidades), np.float64, True),
+                                                     (nome_feromonio, (num_colonias, num_cidades, num_cidades), np.float64, False)])
+
+# Modelo de ilhas: várias colônias independentes (cada uma com sua matriz de feromônio) rodando em um pool de
+# processos. A cada intervalo_migracao iterações as colônias trocam seus melhores caminhos, em anel (cada colônia
+# recebe o melhor da anterior) ou de forma global (todas recebem o melhor de todas)
+def algoritmo_ant_colony_ilhas(matriz_dist, num_cidades, num_formigas, num_iteracoes, num_colonias, num_processos=None,
+                               intervalo_migracao=20, migracao='anel', semente=None, **parametros):
+    if migracao not in ('anel', 'global'):
+        raise ValueError(f"Migração desconhecida: {migracao}")
+
+    shm_dist = cria_memoria_compartilhada(np.asarray(matriz_dist, dtype=np.float64))
+    shm_feromonio = cria_memoria_compartilhada(np.ones((num_colonias, num_cidades, num_cidades)))
+
+    estados = [np.random.RandomState(None if semente is None else semente + c).get_state() for c in range(num_colonias)]
+    melhores_caminhos = [None] * num_colonias
+    melhores_distancias = [float('inf')] * num_colonias
+    historicos_colonias = [[] for _ in range(num_colonias)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=num_processos) as pool:
+            iteracoes_restantes = num_iteracoes
+            while iteracoes_restantes > 0:
+                iteracoes_epoca = min(intervalo_migracao, iteracoes_restantes)
+                tarefas = [(shm_dist.name, shm_feromonio.name, num_cidades, num_colonias, c, num_formigas, iteracoes_epoca,
+                            estados[c], melhores_caminhos[c], melhores_distancias[c], parametros) for c in range(num_colonias)]
+                for c, (caminho, distancia, historico, estado) in enumerate(pool.map(executa_epoca_colonia, tarefas)):
+                    melhores_caminhos[c], melhores_distancias[c], estados[c] = caminho, distancia, estado
+                    historicos_colonias[c].extend(historico)
+                iteracoes_restantes -= iteracoes_epoca
+
+                # Migração: o caminho recebido substitui o melhor da colônia quando é mais curto
+                if migracao == 'anel':
+                    origens = [(c - 1) % num_colonias for c in range(num_colonias)]
+                else:
+                    origens = [int(np.argmin(melhores_distancias))] * num_colonias
+                recebidos = [(melhores_caminhos[o], melhores_distancias[o]) for o in origens]
+                for c, (caminho, distancia) in enumerate(recebidos):
+                    if distancia < melhores_distancias[c]:
+                        melhores_caminhos[c], melhores_distancias[c] = caminho, distancia
+    finally:
+        libera_memoria_compartilhada(shm_dist, shm_feromonio)
+
+    melhor_colonia = int(np.argmin(melhores_distancias))
+    historico_melhor_distancia = np.min(historicos_colonias, axis=0).tolist()  # Melhor entre as colônias a cada iteração
+    return melhores_caminhos[melhor_colonia], melhores_distancias[melhor_colonia], historico_melhor_distancia, historicos_colonias
+
+# Gera uma matriz de distâncias simétrica aleatória (usada no benchmark)
+def gera_matriz_dist_aleatoria(num_cidades, dist_min=1, dist_max=250):
+    dist = np.triu(np.random.randint(dist_min, dist_max, (num_cidades, num_cidades)), 1).astype(float)
+    return dist + dist.T
+
+# Compara o tempo de construção dos caminhos (uma iteração) nas versões sequencial e vetorizada
+def benchmark_construcao(tamanhos, num_formigas, semente=0):
+    print(f"{'Cidades':>8} {'Sequencial (s)':>15} {'Vetorizado (s)':>15} {'Speedup':>8} {'Mesmos caminhos':>16}")
+    for num_cidades in tamanhos:
+        np.random.seed(semente)
+        matriz_dist = gera_matriz_dist_aleatoria(num_cidades)
+        matriz_feromonio = inicializa_feromonio(num_cidades)
+
+        np.random.seed(semente)
+        inicio = time.perf_counter()
+        caminhos_seq = [constroi_caminho(matriz_dist, matriz_feromonio, num_cidades) for _ in range(num_formigas)]
+        tempo_seq = time.perf_counter() - inicio
+
+        np.random.seed(semente)
+        inicio = time.perf_counter()
+        caminhos_vet = constroi_caminhos_vetorizado(calcula_matriz_heuristica(matriz_dist), matriz_feromonio, num_formigas)
+        tempo_vet = time.perf_counter() - inicio
+
+        mesmos_caminhos = np.array_equal(np.array(caminhos_seq), caminhos_vet)
+        print(f"{num_cidades:>8} {tempo_seq:>15.4f} {tempo_vet:>15.4f} {tempo_seq / tempo_vet:>7.1f}x {str(mesmos_caminhos):>16}")
+
+# Compara tempo e pico de memória de uma atualização de feromônio: matrizes de depósito n×n por formiga e laço
+# duplo (atualiza_nivel_feromonio) contra a atualização incremental no próprio array
+def benchmark_feromonio(tamanhos, num_formigas, taxa_evaporacao, feromonio_excretado, parametro_elitismo, semente=0):
+    print(f"{'Cidades':>8} {'Completa (s)':>13} {'Memória (MB)':>13} {'Incremental (s)':>16} {'Memória (MB)':>13} {'Diferença máx.':>15}")
+    for num_cidades in tamanhos:
+        np.random.seed(semente)
+        matriz_dist = gera_matriz_dist_aleatoria(num_cidades)
+        caminhos = [np.random.permutation(num_cidades) for _ in range(num_formigas)]
+        melhor_caminho = caminhos[0]
+
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        matriz_completa = inicializa_feromonio(num_cidades)
         matriz_deposito = np.zeros((num_cidades, num_cidades))
         for caminho in caminhos:
             matriz_deposito += calcula_deposito_feromonio(caminho, num_cidades, feromonio_excretado, matriz_dist)
-
-        # Elitismo: reforça o melhor caminho global
         matriz_deposito += calcula_deposito_feromonio(melhor_caminho, num_cidades, feromonio_excretado * parametro_elitismo, matriz_dist)
+        matriz_completa = atualiza_nivel_feromonio(matriz_completa, num_cidades, taxa_evaporacao, matriz_deposito)
+        tempo_completa = time.perf_counter() - inicio
+        memoria_completa = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
 
-        matriz_feromonio = atualiza_nivel_feromonio(matriz_feromonio, num_cidades, taxa_evaporacao, matriz_deposito)
+        matriz_incremental = inicializa_feromonio(num_cidades)  # Alocada fora da medição: é reaproveitada entre iterações
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        atualiza_feromonio_incremental(matriz_incremental, caminhos, melhor_caminho, taxa_evaporacao, feromonio_excretado, parametro_elitismo, matriz_dist)
+        tempo_incremental = time.perf_counter() - inicio
+        memoria_incremental = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
 
-        historico_melhor_distancia.append(melhor_distancia)  # Armazena a melhor distância de cada iteração
+        diferenca = np.max(np.abs(matriz_completa - matriz_incremental))
+        print(f"{num_cidades:>8} {tempo_completa:>13.4f} {memoria_completa:>13.2f} {tempo_incremental:>16.4f} {memoria_incremental:>13.2f} {diferenca:>15.2e}")
 
-    return melhor_caminho, melhor_distancia, historico_melhor_distancia
+# Compara tempo de execução e qualidade da solução do modelo de ilhas para diferentes números de processos
+# (uma colônia por processo, mesmo número de iterações por colônia)
+def benchmark_ilhas(matriz_dist, lista_num_processos, num_formigas, num_iteracoes, intervalo_migracao, semente=0, **parametros):
+    num_cidades = len(matriz_dist)
+    print(f"{'Processos':>9} {'Colônias':>9} {'Tempo (s)':>10} {'Melhor distância':>17} {'Média das colônias':>19}")
+    for num_processos in lista_num_processos:
+        inicio = time.perf_counter()
+        _, melhor_distancia, _, historicos_colonias = algoritmo_ant_colony_ilhas(
+            matriz_dist, num_cidades, num_formigas, num_iteracoes, num_processos, num_processos,
+            intervalo_migracao, semente=semente, **parametros)
+        tempo = time.perf_counter() - inicio
+        media_colonias = np.mean([historico[-1] for historico in historicos_colonias])
+        print(f"{num_processos:>9} {num_processos:>9} {tempo:>10.2f} {melhor_distancia:>17.1f} {media_colonias:>19.1f}")
 
 if __name__ == "__main__":
     # Inicialização dos parâmetros do algoritmo
@@ -112,14 +568,41 @@ if __name__ == "__main__":
     taxa_evaporacao = 0.95
     feromonio_excretado = 50
     parametro_elitismo = 2  # Fator de reforço para o melhor caminho encontrado
+    vetorizado = True  # Constrói os caminhos de todas as formigas ao mesmo tempo
+    num_candidatos = None  # Ex.: 15 para restringir a escolha às cidades mais próximas (instâncias grandes)
+    num_colonias = 1  # Mais de uma colônia ativa o modelo de ilhas (colônias em paralelo, um processo por colônia)
+    intervalo_migracao = 20  # Iterações entre as trocas de melhores caminhos entre as colônias
+    busca_local = ['2-opt', 'or-opt']  # Operadores de busca local aplicados ao melhor caminho de cada iteração
+
+    # Executa apenas os benchmarks (construção dos caminhos e atualização do feromônio): python ant-colony.py benchmark
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        benchmark_construcao([50, 100, 200, 500], num_formigas)
+        print()
+        benchmark_feromonio([100, 200, 500, 1000], num_formigas, taxa_evaporacao, feromonio_excretado, parametro_elitismo)
+        sys.exit()
+
+    # Benchmark do modelo de ilhas por número de processos: python ant-colony.py benchmark-ilhas
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark-ilhas':
+        np.random.seed(0)
+        lista_num_processos = sorted({1, 2, 4, os.cpu_count()})
+        benchmark_ilhas(gera_matriz_dist_aleatoria(200), lista_num_processos, num_formigas, num_iteracoes, intervalo_migracao,
+                        vetorizado=vetorizado, num_candidatos=num_candidatos, taxa_evaporacao=taxa_evaporacao,
+                        feromonio_excretado=feromonio_excretado, parametro_elitismo=parametro_elitismo)
+        sys.exit()
 
-    matriz_dist = preenche_matriz_dist(arq)
+    matriz_dist = carrega_matriz_dist(arq)
     num_cidades = len(matriz_dist[0])
 
-    matriz_feromonio = inicializa_feromonio(num_cidades)
+    parametros = dict(vetorizado=vetorizado, num_candidatos=num_candidatos, taxa_evaporacao=taxa_evaporacao,
+                      feromonio_excretado=feromonio_excretado, parametro_elitismo=parametro_elitismo, busca_local=busca_local)
 
     # Executa o algoritmo de colônia de formigas
-    melhor_caminho, melhor_distancia, historico_ditancias = algoritmo_ant_colony(matriz_dist, num_cidades, num_formigas, matriz_feromonio, num_iteracoes)
+    if num_colonias > 1:
+        melhor_caminho, melhor_distancia, historico_ditancias, _ = algoritmo_ant_colony_ilhas(
+            matriz_dist, num_cidades, num_formigas, num_iteracoes, num_colonias, intervalo_migracao=intervalo_migracao, **parametros)
+    else:
+        matriz_feromonio = inicializa_feromonio(num_cidades)
+        melhor_caminho, melhor_distancia, historico_ditancias = algoritmo_ant_colony(matriz_dist, num_cidades, num_formigas, matriz_feromonio, num_iteracoes, **parametros)
     
     print(f"Melhor caminho: {melhor_caminho}")
     print(f"Melhor distância: {melhor_distancia}")
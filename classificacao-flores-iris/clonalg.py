@@ -1,125 +1,151 @@
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # nucleo_clonalg.py fica na raiz do repositório
+from nucleo_clonalg import geracao_clonalg
+from utilitarios import cria_contador_avaliacoes, cria_memoria_compartilhada, executa_com_memoria_compartilhada, libera_memoria_compartilhada
 
 # População inicial corresponde aos anticorpos
 def populacao_inicial(tamanho_populacao):
-    populacao = []
-    for _ in range(tamanho_populacao):
-        individuo = np.random.uniform(0.1, 10, (3, 4))  # 3 vetores, cada um com 4 atributos
-        populacao.append(individuo)
-    return np.array(populacao)
-
-# Calcula afinidades dos anticorpos com base na porcentagem de acerto das classificações
-def afinidades(anticorpos, X, y):
-    afinidades = []
-
-    for individuo in anticorpos:
-        predicoes = []
-        for x in X:
-            # Calcula distâncias entre x (características do antígeno) e os 3 vetores do indivíduo
-            distancias = np.linalg.norm(individuo - x, axis=1)
-            classe_previsao = np.argmin(distancias)
-            predicoes.append(classe_previsao)   
-        
-        predicoes = np.array(predicoes)
-        acertos = np.sum(predicoes == y)
-        fitness = acertos / len(y)
-        afinidades.append(fitness)
-
-    return np.array(afinidades)
-
-
-def selecao_melhores_afinidades(anticorpos, afinidades, m):
-    indices = np.argsort(afinidades)[-m:]  # Seleciona os M maiores afinidades
-    return anticorpos[indices], afinidades[indices]
-
-def clonagem(anticorpos, afinidades, total_clones):
-    soma_afinidades = np.sum(afinidades)
-    clones = []
-    clones_qtd = []
-    clones_qtd_int = []
-    soma = 0
-
-    # Calcula quantidade de clones em float e armazena
-    for i in range(len(anticorpos)):
-        qtd = (afinidades[i] / soma_afinidades) * total_clones
-        soma += qtd
-        clones_qtd.append(qtd)
-        clones_qtd_int.append(int(qtd))
-
-    # Calcula quantos clones faltam
-    dif = round(total_clones - sum(clones_qtd_int))
-
-    # Pega as partes decimais para decidir quem recebe os clones restantes
-    partes_decimais = [q - int(q) for q in clones_qtd]
-    # Ordem decrescente
-    indices_desc = np.argsort(partes_decimais)[::-1]
-
-    # Distribui os clones faltantes para os anticorpos com maiores partes decimais
-    for i in range(dif):
-        clones_qtd_int[indices_desc[i]] += 1
-
-    # Gera os clones
-    for i in range(len(anticorpos)):
-        clones.extend([anticorpos[i]] * clones_qtd_int[i])
-
-    return np.array(clones)
-
-# Hipermutação: anticorpos melhores tem mutação menor e piores tem mutação maior
-def hipermutacao(anticorpos, afinidades, beta=0.05):
-    afin_max = np.max(afinidades)
-    taxas_mutacao = (1 - (afinidades / afin_max)) * beta
-    anticorpos_mutada = []
-
-    for i in range(len(anticorpos)):
-        mutacao = np.random.normal(0, taxas_mutacao[i], size=anticorpos[i].shape)
-        anticorpos_mutada.append(anticorpos[i] + mutacao)
-
-    return np.array(anticorpos_mutada)
-
-# Gera os indivíduos que faltam após clonagem
-def nova_geracao(num_anticorpos, total_clones):
-    qntd = num_anticorpos - total_clones
-    return populacao_inicial(qntd)
-
-# Função principal do Algoritmo Imunológico
-def clonalg(num_anticorpos, num_geracoes, m, total_clones, X_train, y_train):
+    return np.random.uniform(0.1, 10, (tamanho_populacao, 3, 4))  # 3 vetores por indivíduo, cada um com 4 atributos
+
+# Calcula afinidades dos anticorpos com base na porcentagem de acerto das classificações. As distâncias de todos os
+# protótipos (anticorpos x classes) a todas as amostras saem de uma única multiplicação de matrizes, usando
+# |a - x|² = |a|² - 2 a·x + |x|² (|x|² é o mesmo para todos os protótipos e não muda a classe prevista).
+# Com tamanho_bloco as amostras são processadas em blocos, limitando a memória a anticorpos x classes x tamanho_bloco
+def afinidades(anticorpos, X, y, tamanho_bloco=None):
+    anticorpos = np.asarray(anticorpos, dtype=np.float64)
+    num_anticorpos, num_classes, num_atributos = anticorpos.shape
+    prototipos = anticorpos.reshape(-1, num_atributos)
+    normas_prototipos = np.einsum('ij,ij->i', prototipos, prototipos)
+    tamanho_bloco = tamanho_bloco or len(X)
+
+    acertos = np.zeros(num_anticorpos, dtype=np.int64)
+    for inicio in range(0, len(X), tamanho_bloco):
+        bloco = np.asarray(X[inicio:inicio + tamanho_bloco], dtype=np.float64)
+        distancias = normas_prototipos[:, None] - 2 * (prototipos @ bloco.T)
+        predicoes = np.argmin(distancias.reshape(num_anticorpos, num_classes, -1), axis=1)
+        acertos += np.sum(predicoes == y[inicio:inicio + tamanho_bloco], axis=1)
+
+    return acertos / len(y)
+
+# Gera os índices dos mini-lotes: percorre as amostras em uma ordem embaralhada, um lote de tamanho fixo por vez
+# (as amostras que sobram no fim da passada ficam para a próxima ordem), e embaralha de novo a cada passada
+def mini_lotes(num_amostras, tamanho_lote):
+    tamanho_lote = min(tamanho_lote, num_amostras)
+    while True:
+        ordem = np.random.permutation(num_amostras)
+        for inicio in range(0, num_amostras - tamanho_lote + 1, tamanho_lote):
+            yield ordem[inicio:inicio + tamanho_lote]
+
+# Função principal do Algoritmo Imunológico (tamanho_bloco: ver afinidades; seleção, clonagem e hipermutação em
+# nucleo_clonalg.py). As afinidades da população acompanham os anticorpos entre as gerações; devolve a melhor
+# solução e a afinidade dela no treino completo, os melhores de cada geração, a curva de convergência (maior afinidade
+# da população a cada geração) e o número de avaliações da afinidade.
+# Com tamanho_lote os anticorpos novos de cada geração são avaliados apenas em um mini-lote de amostras de treino,
+# que muda a cada geração (ver mini_lotes). A cada intervalo_reavaliacao gerações os m melhores são reavaliados no
+# conjunto completo e, antes de escolher a melhor solução, toda a população também é (o último ponto da curva passa
+# a ser a maior afinidade no conjunto completo)
+def clonalg(num_anticorpos, num_geracoes, m, total_clones, X_train, y_train, tamanho_bloco=None, tamanho_lote=None,
+            intervalo_reavaliacao=10):
+    avaliacao_completa = cria_contador_avaliacoes(lambda lote: afinidades(lote, X_train, y_train, tamanho_bloco))
+    avaliacao = avaliacao_completa
+    if tamanho_lote is not None:
+        lotes = mini_lotes(len(y_train), tamanho_lote)
+        # Avalia no mini-lote da geração atual (X_lote e y_lote são trocados a cada geração)
+        avaliacao = cria_contador_avaliacoes(lambda lote: afinidades(lote, X_lote, y_lote, tamanho_bloco))
+        indices_lote = next(lotes)
+        X_lote, y_lote = X_train[indices_lote], y_train[indices_lote]
+
     anticorpos = populacao_inicial(num_anticorpos)
+    afinidades_anticorpos = avaliacao(anticorpos)
     historico = []  # Armazena informações para fazer o gráfico
+    historico_afinidade = []
+
+    for geracao in range(num_geracoes):
+        if tamanho_lote is not None:
+            indices_lote = next(lotes)
+            X_lote, y_lote = X_train[indices_lote], y_train[indices_lote]
+
+        anticorpos, afinidades_anticorpos, melhores_anti = geracao_clonalg(
+            anticorpos, afinidades_anticorpos, avaliacao, populacao_inicial, m, total_clones, beta=0.05)
+
+        # Reavaliação periódica dos m melhores no conjunto completo (corrige os que foram favorecidos por um mini-lote)
+        if tamanho_lote is not None and (geracao + 1) % intervalo_reavaliacao == 0:
+            indices_elite = np.argsort(afinidades_anticorpos)[-m:]
+            afinidades_anticorpos[indices_elite] = avaliacao_completa(anticorpos[indices_elite])
 
-    for _ in range(num_geracoes):
-        melhores_anti, afinidades_melhores = selecao_melhores_afinidades(anticorpos, afinidades(anticorpos, X_train, y_train), m)
-        clones = clonagem(melhores_anti, afinidades_melhores, total_clones)
-        clones = hipermutacao(clones, afinidades(clones, X_train, y_train))
-        novos = nova_geracao(num_anticorpos, total_clones)
-        anticorpos = np.vstack((clones, novos))
         historico.append(melhores_anti.copy())  # Armazena os melhores anticorpos de cada geração
+        historico_afinidade.append(np.max(afinidades_anticorpos))
+
+    # Avaliação final no conjunto completo (apenas no modo com mini-lotes)
+    if tamanho_lote is not None:
+        afinidades_anticorpos = avaliacao_completa(anticorpos)
+        if historico_afinidade:
+            historico_afinidade[-1] = np.max(afinidades_anticorpos)
 
     # Encontra o anticorpo com a maior afinidade (melhor solução encontrada)
-    afinidades_finais = afinidades(anticorpos, X_train, y_train)
-    indice_melhor = np.argmax(afinidades_finais)
+    indice_melhor = np.argmax(afinidades_anticorpos)
     melhor_solucao = anticorpos[indice_melhor]
-    return melhor_solucao, historico
+    num_avaliacoes = avaliacao_completa.total + (avaliacao.total if avaliacao is not avaliacao_completa else 0)
+    return melhor_solucao, afinidades_anticorpos[indice_melhor], historico, historico_afinidade, num_avaliacoes
+
+# Multi-início: várias execuções independentes do CLONALG (cada uma com sua semente) em um pool de processos.
+# X_train e y_train são copiados uma única vez para memória compartilhada e lidos pelos processos sem cópia
+
+# Executa uma execução do CLONALG em um processo do pool, com os dados de treino lidos da memória compartilhada
+def executa_clonalg(args):
+    (nome_X, forma_X, nome_y, forma_y, semente, num_anticorpos, num_geracoes, m, total_clones, tamanho_bloco,
+     tamanho_lote, intervalo_reavaliacao) = args
+
+    def execucao(X_train, y_train):
+        np.random.seed(semente)
+        melhor_solucao, afinidade_melhor, _, historico_afinidade, num_avaliacoes = clonalg(
+            num_anticorpos, num_geracoes, m, total_clones, X_train, y_train, tamanho_bloco, tamanho_lote, intervalo_reavaliacao)
+        return melhor_solucao, afinidade_melhor, historico_afinidade, num_avaliacoes
+
+    return executa_com_memoria_compartilhada(execucao, [(nome_X, forma_X, np.float64, True), (nome_y, forma_y, np.int64, True)])
+
+# Executa num_execucoes vezes o CLONALG (sementes semente, semente+1, ...) e devolve o melhor conjunto de protótipos
+# (maior afinidade no treino completo ao fim da execução, mesmo no modo com mini-lotes), as curvas de convergência de todas as execuções
+# (execuções x gerações) e o total de avaliações da afinidade
+def clonalg_multi_inicio(num_execucoes, num_anticorpos, num_geracoes, m, total_clones, X_train, y_train, tamanho_bloco=None,
+                         num_processos=None, semente=0, tamanho_lote=None, intervalo_reavaliacao=10):
+    shm_X = cria_memoria_compartilhada(np.asarray(X_train, dtype=np.float64))
+    shm_y = cria_memoria_compartilhada(np.asarray(y_train, dtype=np.int64))
+    try:
+        tarefas = [(shm_X.name, np.shape(X_train), shm_y.name, np.shape(y_train), semente + k,
+                    num_anticorpos, num_geracoes, m, total_clones, tamanho_bloco, tamanho_lote, intervalo_reavaliacao)
+                   for k in range(num_execucoes)]
+        with ProcessPoolExecutor(max_workers=num_processos) as pool:
+            melhores, afinidades_melhores, curvas, avaliacoes = zip(*pool.map(executa_clonalg, tarefas))
+    finally:
+        libera_memoria_compartilhada(shm_X, shm_y)
+
+    curvas = np.array(curvas)
+    melhor_execucao = int(np.argmax(afinidades_melhores))
+    return melhores[melhor_execucao], curvas, sum(avaliacoes)
 
 # Avaliação no conjunto de teste
 def avaliar_solucao(individuo, X, y):
-    predicoes = []
-    for x in X:
-        distancias = np.linalg.norm(individuo - x, axis=1)
-        classe_predita = np.argmin(distancias)
-        predicoes.append(classe_predita)
-    predicoes = np.array(predicoes)
-    return np.mean(predicoes == y)
+    return afinidades(individuo[None], X, y)[0]
 
 if __name__ == "__main__":
     num_anticorpos = 50
     num_geracoes = 40
     m = 5
     total_clones = 45
+    tamanho_bloco = None  # Amostras por bloco no cálculo das afinidades (ex.: 10000 para limitar a memória em bases grandes)
+    tamanho_lote = None  # Amostras do mini-lote avaliado a cada geração (ex.: 1000 em bases grandes); None usa todas
+    intervalo_reavaliacao = 10  # Com mini-lotes: gerações entre as reavaliações dos m melhores no conjunto completo
+    num_execucoes = 1  # Mais de uma execução ativa o multi-início (execuções com sementes diferentes, em paralelo)
+    semente = 0  # Semente da primeira execução do multi-início
 
     inicio = time.time() # marca o tempo de execução
 
@@ -131,15 +157,36 @@ if __name__ == "__main__":
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, shuffle=True, random_state=42)
 
     # Executando o algoritmo imunológico
-    melhor_solucao, historico = clonalg(num_anticorpos, num_geracoes, m, total_clones, X_train, y_train)
+    if num_execucoes > 1:
+        melhor_solucao, curvas, num_avaliacoes = clonalg_multi_inicio(
+            num_execucoes, num_anticorpos, num_geracoes, m, total_clones, X_train, y_train, tamanho_bloco, semente=semente,
+            tamanho_lote=tamanho_lote, intervalo_reavaliacao=intervalo_reavaliacao)
+    else:
+        melhor_solucao, _, historico, _, num_avaliacoes = clonalg(num_anticorpos, num_geracoes, m, total_clones, X_train, y_train,
+                                                               tamanho_bloco, tamanho_lote, intervalo_reavaliacao)
 
     fim = time.time() # marca o tempo de execução
 
     print("Melhor solução encontrada (vetores protótipos por classe):\n", melhor_solucao)
     acuracia_teste = avaliar_solucao(melhor_solucao, X_test, y_test)
     print(f"Acurácia no conjunto de teste: {acuracia_teste:.4f}")
+    print(f"Avaliações da afinidade: {num_avaliacoes}")
     print(f"Tempo de execução: {fim - inicio:.4f} segundos")
 
+    # Multi-início: gráfico das curvas de convergência de todas as execuções (no lugar da animação)
+    if num_execucoes > 1:
+        print(f"Afinidade final no treino: média {curvas[:, -1].mean():.4f} | desvio {curvas[:, -1].std():.4f} | melhor {curvas[:, -1].max():.4f}")
+        fig = plt.figure(figsize=(8, 5))
+        fig.canvas.manager.set_window_title('Algoritmo Imunológico - Multi-início')
+        plt.plot(range(1, num_geracoes + 1), curvas.T, alpha=0.6)
+        plt.xlabel('Geração')
+        plt.ylabel('Afinidade Máxima')
+        plt.title(f'Convergência de {num_execucoes} execuções')
+        plt.grid()
+        plt.savefig('convergencia_multi_inicio.png', dpi=300)
+        plt.show()
+        sys.exit()
+
     # Animação
     fig, ax = plt.subplots(figsize=(8, 6))
     fig.suptitle('Evolução dos Anticorpos - Algoritmo Imunológico')
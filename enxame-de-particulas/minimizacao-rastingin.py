@@ -1,6 +1,13 @@
 from matplotlib.animation import FuncAnimation
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # funcoes_benchmark.py fica na raiz do repositório
+from funcoes_benchmark import FUNCOES
+from historico_frames import HistoricoFrames
 
 def rastrigin(x, A=10):
     x = np.asarray(x)
@@ -59,6 +66,177 @@ def enxame_de_particulas(num_particulas, num_iteracoes, w_min, w_max, c1, c2):
 
     return historico_posicoes, historico_melhor_global, melhor_global, fitness(melhor_global)
 
+# Versão vetorizada: todas as partículas (matriz partículas x dimensões) são atualizadas de uma só vez
+
+# Rastrigin de todas as linhas de X (N x d) em uma única chamada
+def fitness_lote(X):
+    return FUNCOES['rastrigin'](X)
+
+# Um par (r1, r2) por partícula, como na versão com laço
+def calcula_velocidades(velocidades, posicoes, melhores_individuais, melhor_global, w_min, w_max, c1, c2, iteracao, num_iteracoes):
+    r1 = np.random.uniform(0, 1, (len(posicoes), 1))
+    r2 = np.random.uniform(0, 1, (len(posicoes), 1))
+    vel_cognitiva = c1 * r1 * (melhores_individuais - posicoes)
+    vel_social = c2 * r2 * (melhor_global - posicoes)
+    w = ponderacao_inercia(w_min, w_max, iteracao, num_iteracoes)
+    return w * velocidades + vel_cognitiva + vel_social
+
+# Topologias de vizinhança: cada uma é uma matriz de índices (partículas x tamanho da vizinhança), calculada uma vez,
+# em que a linha i lista as partículas que a partícula i consulta (incluindo ela mesma)
+
+# Anel: as k partículas de cada lado (com a volta no fim do vetor)
+def vizinhanca_anel(num_particulas, k=1):
+    deslocamentos = np.arange(-k, k + 1)
+    return (np.arange(num_particulas)[:, None] + deslocamentos) % num_particulas
+
+# Von Neumann: partículas em uma grade quase quadrada (colunas = teto da raiz de num_particulas), vizinhas de cima,
+# de baixo, da esquerda e da direita. As bordas são helicoidais (índices módulo num_particulas: o fim de uma linha
+# continua na seguinte), então a última linha pode ficar incompleta. Com num_particulas = 2 * colunas as vizinhas de
+# cima e de baixo coincidiriam e a grade ganha uma coluna; assim, a partir de 5 partículas (mesmo com num_particulas
+# primo), toda partícula tem quatro vizinhas distintas
+def vizinhanca_von_neumann(num_particulas):
+    colunas = int(np.ceil(np.sqrt(num_particulas)))
+    if num_particulas == 2 * colunas:
+        colunas += 1
+    deslocamentos = np.array([0, -colunas, colunas, -1, 1])
+    return (np.arange(num_particulas)[:, None] + deslocamentos) % num_particulas
+
+# Aleatória: a própria partícula e mais k sorteadas (com reposição)
+def vizinhanca_aleatoria(num_particulas, k=3):
+    return np.column_stack((np.arange(num_particulas), np.random.randint(0, num_particulas, (num_particulas, k))))
+
+TOPOLOGIAS = ('global', 'anel', 'von-neumann', 'aleatoria')
+
+# Cria a matriz de vizinhos da topologia ('global' não usa vizinhança: todas as partículas seguem o melhor global)
+def cria_vizinhanca(topologia, num_particulas, tamanho_vizinhanca):
+    if topologia == 'global':
+        return None
+    if topologia == 'anel':
+        return vizinhanca_anel(num_particulas, tamanho_vizinhanca)
+    if topologia == 'von-neumann':
+        return vizinhanca_von_neumann(num_particulas)
+    if topologia == 'aleatoria':
+        return vizinhanca_aleatoria(num_particulas, tamanho_vizinhanca)
+    raise ValueError(f"Topologia desconhecida: {topologia}. Disponíveis: {', '.join(TOPOLOGIAS)}")
+
+# Índice do melhor individual da vizinhança de cada partícula: um argmin por linha da matriz de fitness dos vizinhos
+def melhores_vizinhancas(vizinhanca, fitness_individuais):
+    fitness_vizinhos = fitness_individuais[vizinhanca]
+    return np.take_along_axis(vizinhanca, np.argmin(fitness_vizinhos, axis=1)[:, None], axis=1)[:, 0]
+
+# historico_posicoes e historico_melhor_global são HistoricoFrames (por padrão em memória, um frame por iteração).
+# Com topologia diferente de 'global' o termo social usa o melhor da vizinhança de cada partícula (tamanho_vizinhanca
+# é o k do anel e da aleatória); na aleatória as vizinhanças são sorteadas de novo quando o melhor global não melhora.
+# avaliacao calcula o fitness de um lote de posições (uma chamada na inicialização e uma por iteração)
+def enxame_de_particulas_vetorizado(num_particulas, num_iteracoes, w_min, w_max, c1, c2, dim=2, historico_posicoes=None, historico_melhor_global=None, topologia='global', tamanho_vizinhanca=1, avaliacao=fitness_lote):
+    # Inicializa partículas
+    posicoes = inicializa_nuvem_particulas(num_particulas, dim)
+    velocidades = np.zeros_like(posicoes)
+
+    # Inicializa melhores individuais e global (o fitness dos melhores individuais fica guardado)
+    melhores_individuais = posicoes.copy()
+    fitness_individuais = avaliacao(posicoes)
+    indice_global = np.argmin(fitness_individuais)
+    melhor_global = melhores_individuais[indice_global].copy()
+    fitness_global = fitness_individuais[indice_global]
+    vizinhanca = cria_vizinhanca(topologia, num_particulas, tamanho_vizinhanca)
+    if historico_posicoes is None:
+        historico_posicoes = HistoricoFrames()
+    if historico_melhor_global is None:
+        historico_melhor_global = HistoricoFrames()
+    historico_posicoes.registra(0, posicoes)
+    historico_melhor_global.registra(0, melhor_global)
+
+    for it in range(num_iteracoes):
+        # Referência social: o melhor global ou, em cada linha, o melhor da vizinhança da partícula
+        if vizinhanca is None:
+            referencia_social = melhor_global
+        else:
+            referencia_social = melhores_individuais[melhores_vizinhancas(vizinhanca, fitness_individuais)]
+
+        # Atualiza velocidades e posições de todas as partículas
+        velocidades = calcula_velocidades(velocidades, posicoes, melhores_individuais, referencia_social, w_min, w_max, c1, c2, it, num_iteracoes)
+        posicoes = calcula_posicao(posicoes, velocidades)
+
+        # Atualiza os melhores individuais (uma avaliação por partícula)
+        fitness_posicoes = avaliacao(posicoes)
+        melhorou = fitness_posicoes < fitness_individuais
+        melhores_individuais[melhorou] = posicoes[melhorou]
+        fitness_individuais[melhorou] = fitness_posicoes[melhorou]
+
+        # Atualiza o melhor global a partir do fitness já guardado
+        indice_global = np.argmin(fitness_individuais)
+        if fitness_individuais[indice_global] < fitness_global:
+            melhor_global = melhores_individuais[indice_global].copy()
+            fitness_global = fitness_individuais[indice_global]
+        elif topologia == 'aleatoria':
+            vizinhanca = vizinhanca_aleatoria(num_particulas, tamanho_vizinhanca)
+
+        historico_posicoes.registra(it + 1, posicoes)
+        historico_melhor_global.registra(it + 1, melhor_global)
+
+    historico_posicoes.finaliza()
+    historico_melhor_global.finaliza()
+    return historico_posicoes, historico_melhor_global, melhor_global, fitness_global
+
+# Benchmark com várias execuções independentes: cada execução tem sua semente e roda em um processo do pool
+
+# Envolve a função de avaliação em lote e, a cada chamada, registra o total acumulado de avaliações e o instante
+# (perf_counter) em que a chamada terminou: uma entrada para a população inicial e uma por iteração
+def cria_registro_avaliacoes(avaliacao=fitness_lote):
+    def registro(X):
+        resultado = avaliacao(X)
+        registro.avaliacoes.append((registro.avaliacoes[-1] if registro.avaliacoes else 0) + len(X))
+        registro.instantes.append(time.perf_counter())
+        return resultado
+
+    registro.avaliacoes = []
+    registro.instantes = []
+    return registro
+
+# Executa uma rodada do PSO vetorizado com a semente dada e devolve a curva do melhor fitness por iteração, o tempo
+# total e, por iteração, o número de avaliações da função e o tempo decorrido (medidos pelo registro de avaliações).
+# Só o último frame das posições é guardado; a curva é calculada no fim a partir do histórico do melhor global (fora
+# da medição de tempo e da contagem de avaliações)
+def executa_rodada(args):
+    semente, num_particulas, num_iteracoes, parametros = args
+    np.random.seed(semente)
+    historico_posicoes = HistoricoFrames('anel', capacidade=1)
+    historico_melhor_global = HistoricoFrames()
+    registro = cria_registro_avaliacoes()
+    inicio = time.perf_counter()
+    historico_posicoes, historico_melhor_global, _, _ = enxame_de_particulas_vetorizado(
+        num_particulas, num_iteracoes, historico_posicoes=historico_posicoes, historico_melhor_global=historico_melhor_global,
+        avaliacao=registro, **parametros)
+    tempo = time.perf_counter() - inicio
+    curva = fitness_lote(np.array([historico_melhor_global[i] for i in range(len(historico_melhor_global))]))
+    return curva, tempo, np.array(registro.avaliacoes), np.array(registro.instantes) - inicio
+
+# Executa num_execucoes rodadas (sementes semente, semente+1, ...) para cada configuração e mostra média, desvio
+# padrão e mediana do melhor valor, o tempo médio e, para as rodadas que chegam ao alvo, a mediana de avaliações e
+# de tempo até o alvo (medidos na iteração em que o alvo foi atingido). Devolve, para cada configuração, as curvas,
+# os tempos totais e as avaliações e tempos acumulados por iteração (execuções x iterações) de todas as rodadas
+def benchmark_execucoes(configuracoes, num_particulas, num_iteracoes, num_execucoes, alvo, num_processos=None, semente=0):
+    resultados = {}
+    print(f"{'Configuração':<40} {'Média':>9} {'Desvio':>9} {'Mediana':>9} {'Tempo (s)':>10} {'Sucesso':>8} {'Aval. alvo':>11} {'Tempo alvo (s)':>15}")
+    with ProcessPoolExecutor(max_workers=num_processos) as pool:
+        for nome, parametros in configuracoes.items():
+            tarefas = [(semente + r, num_particulas, num_iteracoes, parametros) for r in range(num_execucoes)]
+            curvas, tempos, avaliacoes, instantes = map(np.array, zip(*pool.map(executa_rodada, tarefas)))
+            resultados[nome] = (curvas, tempos, avaliacoes, instantes)
+
+            finais = curvas[:, -1]
+            sucesso = curvas.min(axis=1) <= alvo
+            iteracao_alvo = np.argmax(curvas <= alvo, axis=1)[sucesso]
+            if sucesso.any():
+                avaliacoes_alvo = f"{np.median(avaliacoes[sucesso, iteracao_alvo]):>11.0f}"
+                tempo_alvo = f"{np.median(instantes[sucesso, iteracao_alvo]):>15.4f}"
+            else:
+                avaliacoes_alvo, tempo_alvo = f"{'-':>11}", f"{'-':>15}"
+            print(f"{nome:<40} {finais.mean():>9.4f} {finais.std():>9.4f} {np.median(finais):>9.4f} {tempos.mean():>10.4f} "
+                  f"{sucesso.sum():>4}/{num_execucoes:<3} {avaliacoes_alvo} {tempo_alvo}")
+    return resultados
+
 if __name__ == "__main__":
     # Parâmetros do algoritmo
     num_particulas = 50  # Número de partículas na nuvem
@@ -67,9 +245,40 @@ if __name__ == "__main__":
     c2 = 1.5  # Coeficiente social
     w_min = 0.4  # Peso de inércia mínimo
     w_max = 0.9  # Peso de inércia máximo
+    dim = 2  # Número de dimensões (a animação mostra as duas primeiras)
+    vetorizado = True  # Atualiza todas as partículas de uma só vez
+    # Histórico para a animação (versão vetorizada): 'memoria', 'anel', 'memmap' ou 'npz' (ver historico_frames.py)
+    modo_historico = 'memoria'
+    intervalo_historico = 1  # Guarda um frame a cada intervalo_historico iterações
+    frames_anel = 30  # Modo 'anel': guarda só os últimos frames_anel frames
+    # Topologia da versão vetorizada: 'global', 'anel', 'von-neumann' ou 'aleatoria'
+    topologia = 'global'
+    tamanho_vizinhanca = 1  # Vizinhos de cada lado no 'anel'; vizinhos sorteados na 'aleatoria'
+
+    # Benchmark com execuções independentes e sementes fixas: python minimizacao-rastingin.py benchmark
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        num_execucoes = 30
+        alvo = 1e-4  # Valor da função considerado como ótimo atingido
+        base = dict(w_min=w_min, w_max=w_max, c1=c1, c2=c2, dim=dim)
+        configuracoes = {
+            f'w={w_min}-{w_max} c1={c1} c2={c2} global': dict(base),
+            f'w={w_min}-{w_max} c1={c1} c2={c2} anel': dict(base, topologia='anel'),
+            f'w=0.4-0.7 c1=2.0 c2=2.0 global': dict(base, w_max=0.7, c1=2.0, c2=2.0),
+        }
+        benchmark_execucoes(configuracoes, num_particulas, num_iteracoes, num_execucoes, alvo)
+        sys.exit()
 
     # Executando o algoritmo de enxame de partículas
-    historico_posicoes, historico_melhor_global, melhor_posicao, melhor_valor = enxame_de_particulas(num_particulas, num_iteracoes, w_min, w_max, c1, c2)
+    if vetorizado:
+        capacidade = frames_anel if modo_historico == 'anel' else num_iteracoes // intervalo_historico + 1
+        extensao = 'npz' if modo_historico == 'npz' else 'npy'
+        historico_posicoes = HistoricoFrames(modo_historico, intervalo_historico, capacidade, f'historico_posicoes.{extensao}')
+        historico_melhor_global = HistoricoFrames(modo_historico, intervalo_historico, capacidade, f'historico_melhor_global.{extensao}')
+        historico_posicoes, historico_melhor_global, melhor_posicao, melhor_valor = enxame_de_particulas_vetorizado(
+            num_particulas, num_iteracoes, w_min, w_max, c1, c2, dim, historico_posicoes, historico_melhor_global,
+            topologia, tamanho_vizinhanca)
+    else:
+        historico_posicoes, historico_melhor_global, melhor_posicao, melhor_valor = enxame_de_particulas(num_particulas, num_iteracoes, w_min, w_max, c1, c2)
     print(f"Melhor posição encontrada: {[f'{x:.4f}' for x in melhor_posicao]}")
     print(f"Melhor valor da função Rastrigin: {melhor_valor:.4f}")
 
@@ -77,7 +286,7 @@ if __name__ == "__main__":
     x = np.linspace(-5.12, 5.12, 200)
     y = np.linspace(-5.12, 5.12, 200)
     X, Y = np.meshgrid(x, y)
-    Z = np.vectorize(lambda x, y: rastrigin([x, y]))(X, Y)
+    Z = FUNCOES['rastrigin'](np.column_stack((X.ravel(), Y.ravel()))).reshape(X.shape)
 
     fig, ax = plt.subplots(figsize=(8, 6))
     cont = ax.contourf(X, Y, Z, levels=50, cmap='viridis')
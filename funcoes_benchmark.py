@@ -0,0 +1,65 @@
+# Funções de benchmark avaliadas em lote, usadas pelos scripts de AG, PSO e CLONALG.
+# Cada função recebe uma matriz (N, d), um indivíduo por linha, e devolve os N valores de uma vez.
+# Um vetor (d,) é tratado como um único indivíduo e devolve um único valor.
+# Com float32=True os cálculos são feitos em precisão simples (metade da memória, mais rápido em lotes grandes)
+import numpy as np
+
+# Converte a entrada para matriz (N, d) no tipo escolhido
+def prepara_lote(X, float32=False):
+    return np.atleast_2d(np.asarray(X, dtype=np.float32 if float32 else np.float64))
+
+# Devolve um único valor quando a entrada era um único indivíduo
+def formata_resultado(X, valores):
+    return valores[0] if np.ndim(X) == 1 else valores
+
+# Função Rastrigin (minimização, mínimo 0 em x = 0)
+def rastrigin(X, A=10, float32=False):
+    Z = prepara_lote(X, float32)
+    valores = A * Z.shape[1] + np.sum(Z**2 - A * np.cos(2 * np.pi * Z), axis=1)
+    return formata_resultado(X, valores)
+
+# Função Alpine2 (maximização)
+def alpine2(X, float32=False):
+    Z = prepara_lote(X, float32)
+    valores = np.prod(np.sqrt(Z) * np.sin(Z), axis=1)
+    return formata_resultado(X, valores)
+
+# Função Schaffer F6 (maximização, máximo 1 em x = 0). Em d dimensões usa a distância à origem (soma dos quadrados
+# de todas as variáveis); para d = 2 é a mesma fórmula de schaffers-maximizacao/algoritmo-genetico.py
+def schaffers(X, float32=False):
+    Z = prepara_lote(X, float32)
+    soma_quadrados = np.sum(Z**2, axis=1)
+    numerador = np.sin(np.sqrt(soma_quadrados))**2 - 0.5
+    denominador = (1 + 0.001 * soma_quadrados)**2
+    return formata_resultado(X, 0.5 - numerador / denominador)
+
+# Função Schaffer F6 expandida (maximização, máximo 1 em x = 0): média da F6 de duas variáveis aplicada aos pares
+# consecutivos (x1, x2), (x2, x3), ..., (xd, x1). Para d = 2 é igual à schaffers
+def schaffers_expandida(X, float32=False):
+    Z = prepara_lote(X, float32)
+    soma_quadrados = Z**2 + np.roll(Z, -1, axis=1)**2
+    numerador = np.sin(np.sqrt(soma_quadrados))**2 - 0.5
+    denominador = (1 + 0.001 * soma_quadrados)**2
+    return formata_resultado(X, np.mean(0.5 - numerador / denominador, axis=1))
+
+# Registro das funções disponíveis
+FUNCOES = {
+    'rastrigin': rastrigin,
+    'alpine2': alpine2,
+    'schaffers': schaffers,
+    'schaffers-expandida': schaffers_expandida,
+}
+
+# Domínio de busca usado pelos scripts para cada função
+DOMINIOS = {
+    'rastrigin': (-5.12, 5.12),
+    'alpine2': (0.1, 10),
+    'schaffers': (-10, 10),
+    'schaffers-expandida': (-10, 10),
+}
+
+# Busca uma função pelo nome no registro
+def obtem_funcao(nome):
+    if nome not in FUNCOES:
+        raise ValueError(f"Função desconhecida: {nome}. Disponíveis: {', '.join(FUNCOES)}")
+    return FUNCOES[nome]
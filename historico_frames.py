@@ -0,0 +1,71 @@
+# Histórico de frames (posições das partículas, populações) para as animações, com uso de memória limitado.
+# Modos:
+#  - 'memoria': guarda os frames em uma lista (comportamento original)
+#  - 'anel': guarda apenas os últimos `capacidade` frames (buffer circular)
+#  - 'memmap': grava os frames em um arquivo .npy mapeado em memória (`capacidade` = número máximo de frames)
+#  - 'npz': grava cada frame comprimido em um arquivo .npz; na leitura cada frame é carregado só quando pedido
+# Em todos os modos `intervalo` guarda apenas um frame a cada `intervalo` iterações (decimação).
+# A leitura é feita como em uma lista: len(historico), historico[i] e historico.iteracoes[i]
+import zipfile
+from collections import deque
+import numpy as np
+
+MODOS = ('memoria', 'anel', 'memmap', 'npz')
+
+class HistoricoFrames:
+    def __init__(self, modo='memoria', intervalo=1, capacidade=None, arquivo=None):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de histórico desconhecido: {modo}. Disponíveis: {', '.join(MODOS)}")
+        if modo in ('anel', 'memmap') and capacidade is None:
+            raise ValueError(f"O modo '{modo}' precisa de uma capacidade (número máximo de frames)")
+        if modo in ('memmap', 'npz') and arquivo is None:
+            raise ValueError(f"O modo '{modo}' precisa de um arquivo")
+
+        self.modo = modo
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+        self.arquivo = arquivo
+        self.iteracoes = deque(maxlen=capacidade) if modo == 'anel' else []
+        self.frames = deque(maxlen=capacidade) if modo == 'anel' else []
+        self.zip = zipfile.ZipFile(arquivo, 'w', zipfile.ZIP_DEFLATED) if modo == 'npz' else None
+        self.npz = None
+
+    # Registra o frame da iteração (ignorado se a iteração não for múltipla do intervalo)
+    def registra(self, iteracao, frame):
+        if iteracao % self.intervalo != 0:
+            return
+        if self.modo in ('memoria', 'anel'):
+            self.frames.append(np.array(frame))
+        elif self.modo == 'memmap':
+            frame = np.asarray(frame)
+            if len(self.iteracoes) == 0:
+                self.frames = np.lib.format.open_memmap(self.arquivo, mode='w+', dtype=frame.dtype, shape=(self.capacidade,) + frame.shape)
+            if len(self.iteracoes) >= self.capacidade:
+                raise IndexError(f"Histórico cheio: capacidade de {self.capacidade} frames")
+            self.frames[len(self.iteracoes)] = frame
+        else:
+            with self.zip.open(f'frame_{len(self.iteracoes):06d}.npy', 'w', force_zip64=True) as arq:
+                np.lib.format.write_array(arq, np.asarray(frame), allow_pickle=False)
+        self.iteracoes.append(iteracao)
+
+    # Termina a gravação em disco; a partir daqui os frames são lidos do arquivo
+    def finaliza(self):
+        if self.modo == 'memmap' and len(self.iteracoes) > 0:
+            self.frames.flush()
+        elif self.modo == 'npz' and self.zip is not None:
+            self.zip.close()
+            self.zip = None
+            self.npz = np.load(self.arquivo)
+
+    def __len__(self):
+        return len(self.iteracoes)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        if self.modo == 'npz':
+            self.finaliza()
+            return self.npz[f'frame_{indice:06d}']
+        return self.frames[indice]
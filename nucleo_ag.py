@@ -0,0 +1,19 @@
+# Operadores vetorizados compartilhados pelos algoritmos genéticos (alpine2-maximizacao/algoritmo-genetico.py,
+# schaffers-maximizacao/algoritmo-genetico.py e problema-mochila/algoritmo-genetico.py).
+# A população é uma matriz (indivíduos x genes) e cada operador trata todos os indivíduos de uma vez
+import numpy as np
+
+# Função para selecionar os pares de pais por torneio: devolve uma matriz (num_pares x 2) de índices da população
+# (os participantes de cada torneio são sorteados com reposição)
+def selecao_torneio_vetorizada(fitness_populacao, num_pares, tamanho_torneio):
+    torneios = np.random.randint(0, len(fitness_populacao), (num_pares, 2, tamanho_torneio))
+    vencedores = np.argmax(fitness_populacao[torneios], axis=2)
+    return np.take_along_axis(torneios, vencedores[:, :, None], axis=2)[:, :, 0]
+
+# Função para cruzar todos os pares de pais de uma vez (crossover BLX‑α, um filho por par). Os filhos podem sair do
+# domínio; cada script limita os genes como precisar
+def recombinacao_blx_vetorizada(pais1, pais2, alfa=0.3):
+    d = np.abs(pais1 - pais2)
+    menor = np.minimum(pais1, pais2) - alfa * d
+    maior = np.maximum(pais1, pais2) + alfa * d
+    return np.random.uniform(menor, maior)
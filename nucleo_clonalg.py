@@ -0,0 +1,68 @@
+# Núcleo do CLONALG usado por alpine2-maximizacao/clonag.py e classificacao-flores-iris/clonalg.py.
+# As etapas operam sobre a população inteira (um anticorpo por posição do primeiro eixo, de qualquer forma):
+# seleção dos m melhores, clonagem proporcional à afinidade e hipermutação.
+# Cada script fornece a função de afinidade (em lote) e o gerador de anticorpos novos.
+# A afinidade de cada anticorpo é guardada junto com ele: cada anticorpo é avaliado uma única vez
+import numpy as np
+
+# Seleciona os M melhores anticorpos
+def selecao_melhores_afinidades(anticorpos, afinidades, m):
+    indices = np.argsort(afinidades)[-m:]  # Seleciona os M maiores afinidades
+    return anticorpos[indices], afinidades[indices]
+
+# Quantidade de clones de cada anticorpo, proporcional à afinidade e somando total_clones (arredondamento pelos
+# maiores restos: a parte inteira de cada cota e mais um clone para os anticorpos com as maiores partes decimais).
+# Se todas as afinidades forem zero os clones são divididos igualmente
+def quantidades_clones(afinidades, total_clones):
+    soma_afinidades = np.sum(afinidades)
+    if soma_afinidades > 0:
+        cotas = afinidades / soma_afinidades * total_clones
+    else:
+        cotas = np.full(len(afinidades), total_clones / len(afinidades))
+    quantidades = cotas.astype(np.int64)
+
+    # Distribui os clones faltantes para os anticorpos com maiores partes decimais (ordem decrescente)
+    faltantes = round(total_clones - quantidades.sum())
+    indices_desc = np.argsort(cotas - quantidades)[::-1]
+    quantidades[indices_desc[:faltantes]] += 1
+    return quantidades
+
+# Gera os clones (cada anticorpo repetido pela sua quantidade de clones) e as afinidades deles, que são as do
+# anticorpo de origem enquanto não passam pela hipermutação
+def clonagem(anticorpos, afinidades, total_clones):
+    quantidades = quantidades_clones(afinidades, total_clones)
+    return np.repeat(anticorpos, quantidades, axis=0), np.repeat(afinidades, quantidades)
+
+# Hipermutação: anticorpos melhores tem mutação menor e piores tem mutação maior. Um único sorteio gaussiano para
+# todos os anticorpos, escalado pela taxa de cada um; com limites (mínimo, máximo) os valores são limitados ao domínio.
+# Se todas as afinidades forem zero todos recebem a taxa máxima (beta)
+def hipermutacao(anticorpos, afinidades, beta, limites=None):
+    maior_afinidade = np.max(afinidades)
+    if maior_afinidade > 0:
+        taxas_mutacao = (1 - (afinidades / maior_afinidade)) * beta
+    else:
+        taxas_mutacao = np.full(len(afinidades), beta)
+    mutacao = np.random.normal(0, 1, anticorpos.shape) * taxas_mutacao.reshape((-1,) + (1,) * (anticorpos.ndim - 1))
+    anticorpos_mutados = anticorpos + mutacao
+    if limites is not None:
+        anticorpos_mutados = np.clip(anticorpos_mutados, *limites)
+    return anticorpos_mutados
+
+# Uma geração do CLONALG: seleciona os m melhores, clona proporcionalmente à afinidade e aplica a hipermutação (taxas
+# pela afinidade de origem dos clones, sem nova avaliação); só os clones mutados e os anticorpos novos são avaliados. Os sobreviventes são os melhores entre a população atual e os
+# clones mutados, e o restante da população (len(anticorpos) - total_clones) é preenchido com anticorpos novos.
+# avaliacao calcula as afinidades de um lote de anticorpos e novos_anticorpos(quantidade) gera anticorpos aleatórios.
+# Devolve a nova população, as afinidades dela e os m melhores anticorpos selecionados
+def geracao_clonalg(anticorpos, afinidades_anticorpos, avaliacao, novos_anticorpos, m, total_clones, beta, limites=None):
+    melhores_anti, afinidades_melhores = selecao_melhores_afinidades(anticorpos, afinidades_anticorpos, m)
+    clones, afinidades_clones = clonagem(melhores_anti, afinidades_melhores, total_clones)
+    clones = hipermutacao(clones, afinidades_clones, beta, limites)
+
+    # Sobreviventes: os total_clones melhores entre a população atual e os clones mutados
+    candidatos = np.concatenate((anticorpos, clones))
+    afinidades_candidatos = np.concatenate((afinidades_anticorpos, avaliacao(clones)))
+    sobreviventes, afinidades_sobreviventes = selecao_melhores_afinidades(candidatos, afinidades_candidatos, total_clones)
+
+    novos = novos_anticorpos(len(anticorpos) - total_clones)
+    nova_populacao = np.concatenate((sobreviventes, novos))
+    return nova_populacao, np.concatenate((afinidades_sobreviventes, avaliacao(novos))), melhores_anti
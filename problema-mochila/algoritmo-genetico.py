@@ -1,19 +1,27 @@
 import random
 import time
+from functools import lru_cache
+import os
+import sys
+import numpy as np
 import matplotlib.pyplot as plt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # nucleo_ag.py fica na raiz do repositório
+from nucleo_ag import selecao_torneio_vetorizada
 
-# Variáveis globais para os parametros do gráfico
-melhores_fitness = []
-fitness_medio = []
-
-# Função para gerar a população inicial (aleatoriamente)
-def populacao_inicial(tamanho_populacao, tamanho_individuo, itens, peso_mochila):
+# Função para gerar a população inicial (aleatoriamente). Devolve também o fitness de cada indivíduo,
+# que já é conhecido após a verificação do peso
+def populacao_inicial(tamanho_populacao, tamanho_individuo, itens, peso_mochila, avaliacao=None, restricao=None):
+    avaliacao = avaliacao or (lambda individuo: calcular_valor_peso(individuo, itens))
     populacao = []
+    fitness_populacao = []
     while len(populacao) < tamanho_populacao:
         individuo = [random.randint(0, 1) for _ in range(tamanho_individuo)]
-        if calcular_valor_peso(individuo, itens)[0] <= peso_mochila:
+        peso_total, valor_total = avaliacao(individuo)
+        fitness_individuo = aplica_restricao(individuo, peso_total, valor_total, itens, peso_mochila, restricao)
+        if fitness_individuo is not None:
             populacao.append(individuo)
-    return populacao
+            fitness_populacao.append(fitness_individuo)
+    return populacao, fitness_populacao
 
 # Função para calcular o fitness de um indivíduo
 def fitness(individuo, itens, peso_mochila):
@@ -28,13 +36,14 @@ def fitness(individuo, itens, peso_mochila):
             
     return valor_total
 
-# Função para selecionar os pais usando o torneio
-def selecao_torneio(populacao, tamanho_torneio, itens, peso_mochila):
+# Função para selecionar os pais usando o torneio (com fitness_populacao, usa o fitness já calculado de cada indivíduo)
+def selecao_torneio(populacao, tamanho_torneio, itens, peso_mochila, fitness_populacao=None):
+    if fitness_populacao is None:
+        fitness_populacao = [fitness(ind, itens, peso_mochila) for ind in populacao]
     pais = []
     for _ in range(tamanho_torneio):
-        torneio = random.sample(populacao, tamanho_torneio)
-        torneio.sort(key=lambda ind: fitness(ind, itens, peso_mochila), reverse=True)
-        pais.append(torneio[0])
+        torneio = random.sample(range(len(populacao)), tamanho_torneio)
+        pais.append(populacao[max(torneio, key=lambda i: fitness_populacao[i])])
     return pais
 
 # Função para cruzar dois indivíduos (recombinação de ponto único)
@@ -51,39 +60,260 @@ def mutacao(individuo, taxa_mutacao):
             individuo[i] = 1 - individuo[i]  # Inverte o bit 
     return individuo
 
-# Função para criar a nova geração
-def nova_geracao(populacao, taxa_mutacao, tamanho_torneio, itens, peso_mochila):
+# Função para criar a nova geração. Cada filho é avaliado uma única vez (na verificação do peso) e o seu
+# fitness é devolvido junto com a nova população
+def nova_geracao(populacao, taxa_mutacao, tamanho_torneio, itens, peso_mochila, fitness_populacao=None, avaliacao=None, restricao=None):
+    avaliacao = avaliacao or (lambda individuo: calcular_valor_peso(individuo, itens))
+    if fitness_populacao is None:
+        fitness_populacao = [fitness(ind, itens, peso_mochila) for ind in populacao]
     nova_populacao = []
+    fitness_nova_populacao = []
     while len(nova_populacao) < len(populacao):
-        pais = selecao_torneio(populacao, tamanho_torneio, itens, peso_mochila)
+        pais = selecao_torneio(populacao, tamanho_torneio, itens, peso_mochila, fitness_populacao)
         filhos = recombinacao(pais[0], pais[1])
         for filho in filhos:
             filho_mutado = mutacao(filho, taxa_mutacao)
-            if calcular_valor_peso(filho_mutado, itens)[0] <= peso_mochila:
+            peso_total, valor_total = avaliacao(filho_mutado)
+            fitness_filho = aplica_restricao(filho_mutado, peso_total, valor_total, itens, peso_mochila, restricao)
+            if fitness_filho is not None:
                 nova_populacao.append(filho_mutado)
-    return nova_populacao
+                fitness_nova_populacao.append(fitness_filho)
+    return nova_populacao, fitness_nova_populacao
 
 # Função para calcular o valor total e o peso total de um indivíduo
 def calcular_valor_peso(individuo, itens):
-    peso_total = sum(itens[i][0] for i in range(len(individuo)) if individuo[i] == 1)
-    valor_total = sum(itens[i][1] for i in range(len(individuo)) if individuo[i] == 1)
+    peso_total = 0
+    valor_total = 0
+    for i in range(len(individuo)):
+        if individuo[i] == 1:
+            peso_total += itens[i][0]
+            valor_total += itens[i][1]
     return peso_total, valor_total
 
-# Função principal do algoritmo genético
-def algoritmo_genetico(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes):
-    populacao = populacao_inicial(tamanho_populacao, tamanho_individuo, itens, peso_mochila)
+# Função para criar uma avaliação (peso, valor) com cache LRU entre as gerações: cromossomos repetidos não são
+# recalculados. A chave é o cromossomo em bytes; acertos e falhas ficam em avaliacao.cache_info()
+def cria_avaliacao_com_cache(itens, tamanho_cache=10000):
+    @lru_cache(maxsize=tamanho_cache)
+    def avaliacao_cache(cromossomo):
+        return calcular_valor_peso(cromossomo, itens)
+
+    def avaliacao(individuo):
+        return avaliacao_cache(bytes(individuo))
+
+    avaliacao.cache_info = avaliacao_cache.cache_info
+    return avaliacao
+
+# Função principal do algoritmo genético. Não usa estado global: devolve o melhor indivíduo e as curvas do melhor
+# fitness e do fitness médio de cada geração
+# (avaliacao: função que devolve (peso, valor) de um indivíduo, por exemplo com cache; ver cria_avaliacao_com_cache.
+# restricao: tratamento dos indivíduos acima do peso; ver cria_restricao)
+def algoritmo_genetico(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes, avaliacao=None, restricao=None):
+    melhores_fitness = []
+    fitness_medio = []
+    populacao, fitness_geracao = populacao_inicial(tamanho_populacao, tamanho_individuo, itens, peso_mochila, avaliacao, restricao)
     
     # Gerando uma nova população
     for _ in range(geracoes):
-        populacao = nova_geracao(populacao, taxa_mutacao, tamanho_torneio, itens, peso_mochila)
+        populacao, fitness_geracao = nova_geracao(populacao, taxa_mutacao, tamanho_torneio, itens, peso_mochila, fitness_geracao, avaliacao, restricao)
     
         # Calculando fitness máximo e médio da população
-        fitness_geracao = [fitness(ind, itens, peso_mochila) for ind in populacao]
         melhores_fitness.append(max(fitness_geracao))
         fitness_medio.append(sum(fitness_geracao) / len(fitness_geracao))
     
-    melhor_individuo = max(populacao, key=lambda ind: fitness(ind, itens, peso_mochila))
-    return melhor_individuo
+    melhor_individuo = populacao[max(range(len(populacao)), key=lambda i: fitness_geracao[i])]
+
+    # Com penalidade o melhor indivíduo pode estar acima do peso: repara antes de devolver
+    peso_total, valor_total = calcular_valor_peso(melhor_individuo, itens)
+    if peso_total > peso_mochila:
+        reparar(melhor_individuo, peso_total, valor_total, itens, peso_mochila, ordem_razao_itens(itens))
+    return melhor_individuo, melhores_fitness, fitness_medio
+
+# Tratamento da restrição de peso: em vez de descartar e sortear de novo os indivíduos acima do peso (rejeição),
+# eles podem ser reparados ou penalizados, o que deixa o tempo de cada geração limitado
+
+# Função para ordenar os itens pela razão valor/peso (do menor para o maior)
+def ordem_razao_itens(itens):
+    return sorted(range(len(itens)), key=lambda i: itens[i][1] / itens[i][0] if itens[i][0] > 0 else float('inf'))
+
+# Função para criar a configuração do tratamento da restrição de peso:
+#  - 'rejeicao': descarta o indivíduo (comportamento original)
+#  - 'reparo': remove itens até caber na mochila. Estratégias: 'razao' (remove primeiro os de menor valor/peso),
+#    'razao-completa' (depois adiciona os de maior valor/peso que ainda cabem) e 'aleatoria' (remove itens sorteados)
+#  - 'penalidade': mantém o indivíduo com fitness = valor - coeficiente * excesso de peso. Por padrão o coeficiente
+#    é a maior razão valor/peso, de forma que o excesso nunca compensa. O fitness pode ficar negativo: com capacidades
+#    apertadas, em que quase todos estão acima do peso, o torneio continua preferindo os de menor excesso
+def cria_restricao(itens, tratamento='reparo', estrategia='razao', coeficiente=None):
+    if tratamento not in ('rejeicao', 'reparo', 'penalidade'):
+        raise ValueError(f"Tratamento de restrição desconhecido: {tratamento}")
+    if estrategia not in ('razao', 'razao-completa', 'aleatoria'):
+        raise ValueError(f"Estratégia de reparo desconhecida: {estrategia}")
+    if coeficiente is None:
+        coeficiente = max(valor / peso for peso, valor in itens if peso > 0)
+    return {'tratamento': tratamento, 'estrategia': estrategia, 'coeficiente': coeficiente, 'ordem_razao': ordem_razao_itens(itens)}
+
+# Função para reparar um indivíduo acima do peso (no próprio indivíduo). Devolve o novo peso e valor
+def reparar(individuo, peso_total, valor_total, itens, peso_mochila, ordem_razao, estrategia='razao'):
+    if estrategia == 'aleatoria':
+        ordem_remocao = random.sample(range(len(individuo)), len(individuo))
+    else:
+        ordem_remocao = ordem_razao
+    for i in ordem_remocao:
+        if peso_total <= peso_mochila:
+            break
+        if individuo[i] == 1:
+            individuo[i] = 0
+            peso_total -= itens[i][0]
+            valor_total -= itens[i][1]
+
+    if estrategia == 'razao-completa':
+        for i in reversed(ordem_razao):
+            if individuo[i] == 0 and peso_total + itens[i][0] <= peso_mochila:
+                individuo[i] = 1
+                peso_total += itens[i][0]
+                valor_total += itens[i][1]
+    return peso_total, valor_total
+
+# Função para aplicar o tratamento da restrição a um indivíduo já avaliado. Devolve o fitness do indivíduo ou None
+# se ele deve ser descartado (sem restricao, descarta como na versão original)
+def aplica_restricao(individuo, peso_total, valor_total, itens, peso_mochila, restricao=None):
+    if peso_total <= peso_mochila:
+        return valor_total
+    if restricao is None or restricao['tratamento'] == 'rejeicao':
+        return None
+    if restricao['tratamento'] == 'reparo':
+        return reparar(individuo, peso_total, valor_total, itens, peso_mochila, restricao['ordem_razao'], restricao['estrategia'])[1]
+    return valor_total - restricao['coeficiente'] * (peso_total - peso_mochila)
+
+# Versão vetorizada: a população inteira é uma matriz uint8 (indivíduos x itens) com 0/1 em cada posição
+
+# Função para separar os itens em vetores de pesos e valores (usada pela versão vetorizada)
+def pesos_valores_itens(itens):
+    return np.array([[peso, valor] for peso, valor in itens], dtype=float)
+
+# Função para calcular o peso e o valor de todos os indivíduos com um único produto de matrizes
+def calcular_valor_peso_vetorizado(populacao, pesos_valores):
+    resultado = populacao @ pesos_valores
+    return resultado[:, 0], resultado[:, 1]
+
+# Função para manter apenas os indivíduos que cabem na mochila (devolve também o fitness, que é o valor deles)
+def filtra_validos(populacao, pesos_valores, peso_mochila):
+    peso_total, valor_total = calcular_valor_peso_vetorizado(populacao, pesos_valores)
+    validos = peso_total <= peso_mochila
+    return populacao[validos], valor_total[validos]
+
+# Função para reparar (na própria matriz) os indivíduos acima do peso, com as mesmas estratégias de reparar().
+# Os itens a remover de cada indivíduo são os primeiros, na ordem de remoção, até o peso removido cobrir o excesso
+def reparar_vetorizado(populacao, pesos_valores, peso_mochila, ordem_razao, estrategia='razao'):
+    peso_total = calcular_valor_peso_vetorizado(populacao, pesos_valores)[0]
+    acima = np.flatnonzero(peso_total > peso_mochila)
+    if len(acima) == 0:
+        return populacao
+    pesos = pesos_valores[:, 0]
+    individuos = populacao[acima]
+
+    if estrategia == 'aleatoria':
+        ordem = np.argsort(np.random.random(individuos.shape), axis=1)
+    else:
+        ordem = np.broadcast_to(ordem_razao, individuos.shape)
+    selecionados = np.take_along_axis(individuos, ordem, axis=1)
+    pesos_selecionados = pesos[ordem] * selecionados
+    removido_antes = np.cumsum(pesos_selecionados, axis=1) - pesos_selecionados
+    remover = (selecionados == 1) & (removido_antes < (peso_total[acima] - peso_mochila)[:, None])
+    np.put_along_axis(individuos, ordem, selecionados * ~remover, axis=1)
+
+    if estrategia == 'razao-completa':
+        capacidade = peso_mochila - individuos @ pesos
+        for i in ordem_razao[::-1]:
+            cabe = (individuos[:, i] == 0) & (pesos[i] <= capacidade)
+            individuos[cabe, i] = 1
+            capacidade[cabe] -= pesos[i]
+
+    populacao[acima] = individuos
+    return populacao
+
+# Função para aplicar o tratamento da restrição a um lote de indivíduos. Devolve os indivíduos mantidos e o fitness deles
+def aplica_restricao_vetorizada(populacao, pesos_valores, peso_mochila, restricao=None):
+    if restricao is None or restricao['tratamento'] == 'rejeicao':
+        return filtra_validos(populacao, pesos_valores, peso_mochila)
+    if restricao['tratamento'] == 'reparo':
+        populacao = reparar_vetorizado(populacao, pesos_valores, peso_mochila, np.array(restricao['ordem_razao']), restricao['estrategia'])
+        return populacao, calcular_valor_peso_vetorizado(populacao, pesos_valores)[1]
+    peso_total, valor_total = calcular_valor_peso_vetorizado(populacao, pesos_valores)
+    excesso = np.maximum(peso_total - peso_mochila, 0)
+    return populacao, valor_total - restricao['coeficiente'] * excesso
+
+# Função para calcular quantos indivíduos gerar em uma rodada. Com reparo ou penalidade todos são mantidos e bastam
+# os que faltam (uma única rodada); na rejeição os que faltam são divididos pela taxa de aceitação da rodada anterior
+# (o dobro da rodada anterior se nenhum foi aceito), para não precisar de muitas rodadas pequenas
+def tamanho_lote(faltantes, gerados, aceitos, restricao=None):
+    if gerados == 0 or (restricao is not None and restricao['tratamento'] != 'rejeicao'):
+        return faltantes
+    if aceitos == 0:
+        return 2 * gerados
+    return int(np.ceil(faltantes * gerados / aceitos))
+
+# Função para gerar a população inicial (aleatoriamente), sorteando um lote inteiro de indivíduos por vez
+def populacao_inicial_vetorizada(tamanho_populacao, tamanho_individuo, pesos_valores, peso_mochila, restricao=None):
+    populacao = np.empty((0, tamanho_individuo), dtype=np.uint8)
+    fitness_populacao = np.empty(0)
+    gerados = aceitos = 0
+    while len(populacao) < tamanho_populacao:
+        gerados = tamanho_lote(tamanho_populacao - len(populacao), gerados, aceitos, restricao)
+        candidatos = np.random.randint(0, 2, (gerados, tamanho_individuo), dtype=np.uint8)
+        validos, fitness_validos = aplica_restricao_vetorizada(candidatos, pesos_valores, peso_mochila, restricao)
+        aceitos = len(validos)
+        populacao = np.vstack((populacao, validos))
+        fitness_populacao = np.concatenate((fitness_populacao, fitness_validos))
+    return populacao[:tamanho_populacao], fitness_populacao[:tamanho_populacao]
+
+# Função para cruzar todos os pares de pais (recombinação de ponto único, um ponto por par)
+def recombinacao_vetorizada(pais1, pais2):
+    pontos_cruzamento = np.random.randint(1, pais1.shape[1], len(pais1))
+    mascara = np.arange(pais1.shape[1]) < pontos_cruzamento[:, None]
+    filhos1 = np.where(mascara, pais1, pais2)
+    filhos2 = np.where(mascara, pais2, pais1)
+    return np.vstack((filhos1, filhos2))
+
+# Função para aplicar mutação em todos os indivíduos (inverte bits)
+def mutacao_vetorizada(populacao, taxa_mutacao):
+    return populacao ^ (np.random.random(populacao.shape) < taxa_mutacao)
+
+# Função para criar a nova geração, produzindo os filhos em lotes (ver tamanho_lote; devolve também o fitness da nova
+# geração)
+def nova_geracao_vetorizada(populacao, fitness_populacao, taxa_mutacao, tamanho_torneio, pesos_valores, peso_mochila, restricao=None):
+    nova_populacao = np.empty((0, populacao.shape[1]), dtype=np.uint8)
+    fitness_nova_populacao = np.empty(0)
+    gerados = aceitos = 0
+    while len(nova_populacao) < len(populacao):
+        num_pares = (tamanho_lote(len(populacao) - len(nova_populacao), gerados, aceitos, restricao) + 1) // 2
+        pares = selecao_torneio_vetorizada(fitness_populacao, num_pares, tamanho_torneio)
+        filhos = recombinacao_vetorizada(populacao[pares[:, 0]], populacao[pares[:, 1]])
+        filhos = mutacao_vetorizada(filhos, taxa_mutacao)
+        validos, fitness_validos = aplica_restricao_vetorizada(filhos, pesos_valores, peso_mochila, restricao)
+        gerados, aceitos = len(filhos), len(validos)
+        nova_populacao = np.vstack((nova_populacao, validos))
+        fitness_nova_populacao = np.concatenate((fitness_nova_populacao, fitness_validos))
+    return nova_populacao[:len(populacao)], fitness_nova_populacao[:len(populacao)]
+
+# Função principal do algoritmo genético (versão vetorizada, mesmas saídas da versão com listas)
+def algoritmo_genetico_vetorizado(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes, restricao=None):
+    pesos_valores = pesos_valores_itens(itens)
+    melhores_fitness = []
+    fitness_medio = []
+    populacao, fitness_geracao = populacao_inicial_vetorizada(tamanho_populacao, tamanho_individuo, pesos_valores, peso_mochila, restricao=restricao)
+
+    # Gerando uma nova população
+    for _ in range(geracoes):
+        populacao, fitness_geracao = nova_geracao_vetorizada(populacao, fitness_geracao, taxa_mutacao, tamanho_torneio, pesos_valores, peso_mochila, restricao=restricao)
+
+        # Calculando fitness máximo e médio da população
+        melhores_fitness.append(fitness_geracao.max())
+        fitness_medio.append(fitness_geracao.mean())
+
+    # Com penalidade o melhor indivíduo pode estar acima do peso: repara antes de devolver
+    melhor_individuo = populacao[[np.argmax(fitness_geracao)]]
+    melhor_individuo = reparar_vetorizado(melhor_individuo, pesos_valores, peso_mochila, np.array(ordem_razao_itens(itens)))
+    return melhor_individuo[0].tolist(), melhores_fitness, fitness_medio
 
 # Função para criar os itens (peso e valor)
 def criar_itens(quantidade_itens):
@@ -104,11 +334,23 @@ if __name__ == "__main__":
     taxa_mutacao = 0.03
     tamanho_torneio = 3
     geracoes = 50
+    vetorizado = True  # População inteira em uma matriz de bits (NumPy)
+    tamanho_cache = 10000  # Cache LRU de avaliações entre as gerações (versão com listas)
+    tratamento_restricao = 'reparo'  # Indivíduos acima do peso: 'rejeicao', 'reparo' ou 'penalidade'
+    estrategia_reparo = 'razao'  # 'razao', 'razao-completa' ou 'aleatoria'
 
     inicio = time.time() # marca o tempo de execução
 
+    restricao = cria_restricao(itens, tratamento_restricao, estrategia_reparo)
+
     # Executando o algoritmo genético
-    melhor_solucao = algoritmo_genetico(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes)
+    if vetorizado:
+        melhor_solucao, melhores_fitness, fitness_medio = algoritmo_genetico_vetorizado(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes, restricao)
+    else:
+        avaliacao = cria_avaliacao_com_cache(itens, tamanho_cache)
+        melhor_solucao, melhores_fitness, fitness_medio = algoritmo_genetico(tamanho_populacao, tamanho_individuo, itens, peso_mochila, taxa_mutacao, tamanho_torneio, geracoes, avaliacao, restricao)
+        info_cache = avaliacao.cache_info()
+        print(f"Cache de avaliações: {info_cache.hits} acertos, {info_cache.misses} avaliações calculadas")
 
     fim = time.time() # marca o tempo de execução
     
@@ -0,0 +1,165 @@
+# Problema da Mochila - Métodos exatos (programação dinâmica e branch-and-bound)
+# Todos devolvem o mesmo (valor, peso) da função mochila de forca-bruta.py: quando incluir ou não um objeto dá o
+# mesmo valor, a solução sem o objeto é escolhida (decidindo do último objeto para o primeiro)
+import heapq
+import random
+import time
+import numpy as np
+
+# Programação dinâmica bottom-up: tabela (n+1) x (peso_mochila+1) com o melhor valor para cada capacidade
+def mochila_pd(peso_mochila, peso_obj, valor_obj, n):
+    tipo = np.result_type(np.asarray(valor_obj[:n]), np.int64)
+    tabela = np.zeros((n + 1, peso_mochila + 1), dtype=tipo)
+
+    for i in range(1, n + 1):
+        peso, valor = peso_obj[i-1], valor_obj[i-1]
+        tabela[i] = tabela[i-1]
+        if peso <= peso_mochila:
+            # melhor valor incluindo o objeto i-1 para todas as capacidades de uma vez
+            np.maximum(tabela[i-1, peso:], tabela[i-1, :peso_mochila + 1 - peso] + valor, out=tabela[i, peso:])
+        tabela[i, 0] = 0  # mochila sem capacidade para (como na força bruta)
+
+    # Reconstrói os objetos escolhidos, do último para o primeiro
+    capacidade = peso_mochila
+    peso_total = 0
+    for i in range(n, 0, -1):
+        if capacidade == 0:
+            break
+        peso = peso_obj[i-1]
+        if peso <= capacidade and tabela[i-1, capacidade - peso] + valor_obj[i-1] > tabela[i-1, capacidade]:
+            peso_total += peso
+            capacidade -= peso
+
+    return tabela[n, peso_mochila].item(), peso_total
+
+# Programação dinâmica com uma única linha de valores. Para reconstruir a solução guarda apenas um bit por
+# (objeto, capacidade) indicando se o objeto foi incluído, compactado com np.packbits (1/64 da tabela completa)
+def mochila_pd_linha(peso_mochila, peso_obj, valor_obj, n):
+    tipo = np.result_type(np.asarray(valor_obj[:n]), np.int64)
+    linha = np.zeros(peso_mochila + 1, dtype=tipo)
+    decisoes = np.zeros((n, (peso_mochila + 8) // 8), dtype=np.uint8)
+
+    for i in range(n):
+        peso, valor = peso_obj[i], valor_obj[i]
+        if peso > peso_mochila:
+            continue
+        com = linha[:peso_mochila + 1 - peso] + valor
+        inclui = np.zeros(peso_mochila + 1, dtype=bool)
+        inclui[peso:] = com > linha[peso:]
+        inclui[0] = False  # mochila sem capacidade para (como na força bruta)
+        linha[inclui] = com[inclui[peso:]]
+        decisoes[i] = np.packbits(inclui)
+
+    # Reconstrói os objetos escolhidos, do último para o primeiro
+    capacidade = peso_mochila
+    peso_total = 0
+    for i in range(n - 1, -1, -1):
+        if capacidade == 0:
+            break
+        if (decisoes[i, capacidade >> 3] >> (7 - (capacidade & 7))) & 1:
+            peso_total += peso_obj[i]
+            capacidade -= peso_obj[i]
+
+    return linha[peso_mochila].item(), peso_total
+
+# Branch-and-bound best-first: sempre expande o nó com o maior limitante (relaxação fracionária, com os objetos
+# livres em ordem de valor/peso). Os objetos são decididos do último para o primeiro, como na força bruta
+def mochila_branch_and_bound(peso_mochila, peso_obj, valor_obj, n):
+    ordem_razao = sorted(range(n), key=lambda i: valor_obj[i] / peso_obj[i] if peso_obj[i] > 0 else float('inf'), reverse=True)
+
+    # Limitante superior: preenche a capacidade restante com os objetos livres (índice < livres) de maior razão,
+    # usando uma fração do primeiro que não couber
+    def limitante(livres, capacidade, valor):
+        for i in ordem_razao:
+            if i >= livres or valor_obj[i] <= 0:
+                continue
+            if peso_obj[i] <= capacidade:
+                capacidade -= peso_obj[i]
+                valor += valor_obj[i]
+            else:
+                return valor + valor_obj[i] * capacidade / peso_obj[i]
+        return valor
+
+    # A melhor solução é comparada por valor e, no empate, pela sequência de decisões (0 = sem o objeto)
+    melhor_valor, melhor_peso, melhor_decisoes = 0, 0, (0,) * n
+    fila = [(-limitante(n, peso_mochila, 0), 0, 0, peso_mochila, 0, ())]
+    contador = 1
+
+    while fila:
+        limite, _, nivel, capacidade, valor, decisoes = heapq.heappop(fila)
+        limite = -limite
+        if limite < melhor_valor or (limite == melhor_valor and decisoes > melhor_decisoes[:nivel]):
+            continue  # não pode superar a melhor solução encontrada
+
+        # Não incluir mais nenhum objeto já é uma solução válida
+        solucao = decisoes + (0,) * (n - nivel)
+        if valor > melhor_valor or (valor == melhor_valor and solucao < melhor_decisoes):
+            melhor_valor, melhor_peso, melhor_decisoes = valor, peso_mochila - capacidade, solucao
+
+        if nivel == n or capacidade == 0:
+            continue
+
+        i = n - 1 - nivel
+        filhos = [(capacidade, valor, decisoes + (0,))]
+        if peso_obj[i] <= capacidade:
+            filhos.append((capacidade - peso_obj[i], valor + valor_obj[i], decisoes + (1,)))
+        for capacidade_filho, valor_filho, decisoes_filho in filhos:
+            limite_filho = limitante(i, capacidade_filho, valor_filho)
+            if limite_filho >= melhor_valor:
+                heapq.heappush(fila, (-limite_filho, contador, nivel + 1, capacidade_filho, valor_filho, decisoes_filho))
+                contador += 1
+
+    return melhor_valor, melhor_peso
+
+# Escolhe o método pelo tamanho da tabela da programação dinâmica (n x capacidade). Pesos não inteiros ou
+# capacidades muito grandes ficam com o branch-and-bound
+def escolhe_metodo(peso_mochila, peso_obj, n, limite_tabela=10**7, limite_linha=10**9):
+    if not all(float(peso).is_integer() for peso in peso_obj[:n]) or not float(peso_mochila).is_integer():
+        return 'branch-and-bound'
+    celulas = n * (peso_mochila + 1)
+    if celulas <= limite_tabela:
+        return 'pd'
+    if celulas <= limite_linha:
+        return 'pd-linha'
+    return 'branch-and-bound'
+
+METODOS = {
+    'pd': mochila_pd,
+    'pd-linha': mochila_pd_linha,
+    'branch-and-bound': mochila_branch_and_bound,
+}
+
+# Resolve o problema da mochila de forma exata, escolhendo o método automaticamente se nenhum for informado
+def mochila(peso_mochila, peso_obj, valor_obj, n, metodo=None):
+    if metodo is None:
+        metodo = escolhe_metodo(peso_mochila, peso_obj, n)
+    if metodo != 'branch-and-bound':
+        peso_mochila = int(peso_mochila)
+        peso_obj = [int(peso) for peso in peso_obj]
+    return METODOS[metodo](peso_mochila, peso_obj, valor_obj, n)
+
+if __name__ == "__main__":
+
+  # definindo as variáveis do problema
+  capacidade_mochila = 200
+  peso_mochila = 500
+  valor_obj = []
+  peso_obj = []
+
+  # gerando os pesos e valores dos objetos aleatoriamente
+  for _ in range(capacidade_mochila):
+    valor_rand = random.randint(10, 100)
+    valor_obj.append(valor_rand)
+    peso_rand = random.randint(1, 20)
+    peso_obj.append(peso_rand)
+
+  print(f"Método escolhido automaticamente: {escolhe_metodo(peso_mochila, peso_obj, capacidade_mochila)}")
+
+  for metodo in METODOS:
+    inicio = time.time() # marca o tempo de execução
+
+    valor_total, peso_total = mochila(peso_mochila, peso_obj, valor_obj, capacidade_mochila, metodo)
+
+    fim = time.time() # marca o tempo de execução
+
+    print(f"[{metodo}] Soma dos pesos: {peso_total} | Soma dos valores: {valor_total} | Tempo de execução: {fim - inicio:.4f}")
@@ -2,35 +2,42 @@ import numpy as np
 import matplotlib.pyplot as plt
 import time
 import random
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib.animation import FuncAnimation
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # funcoes_benchmark.py fica na raiz do repositório
+from funcoes_benchmark import FUNCOES, DOMINIOS, obtem_funcao
+from historico_frames import HistoricoFrames
+from nucleo_ag import selecao_torneio_vetorizada, recombinacao_blx_vetorizada
+from utilitarios import cria_contador_avaliacoes, cria_memoria_compartilhada, executa_com_memoria_compartilhada, libera_memoria_compartilhada
 
-# Variáveis globais para os parâmetros do gráfico
-melhores_fitness = []
-fitness_medio = []
-populacoes_geracoes = []
-
-# Função Schaffer's
+# Função Schaffer's (em N dimensões usa a soma dos quadrados de todas as variáveis)
 def schaffers(x):
-    numerador = np.sin(np.sqrt(x[0]**2 + x[1]**2))**2 - 0.5
-    denominador = (1 + 0.001 * (x[0]**2 + x[1]**2))**2
+    soma_quadrados = np.sum(np.square(x))
+    numerador = np.sin(np.sqrt(soma_quadrados))**2 - 0.5
+    denominador = (1 + 0.001 * soma_quadrados)**2
     return 0.5 - numerador / denominador
 
 # Função para definir a população inicial (aleatoriamente)
-def populacao_inicial(tamanho_populacao):
-    return [[random.uniform(-10, 10), random.uniform(-10, 10)] 
+def populacao_inicial(tamanho_populacao, num_dimensoes=2):
+    return [[random.uniform(-10, 10) for _ in range(num_dimensoes)]
             for _ in range(tamanho_populacao)]
 
 # Função para definir o fitness (própria função)
 def fitness(individuo):
     return schaffers(individuo)
 
-# Função para fazer a seleção dos pais (torneio)
-def selecao_torneio(populacao, tamanho_torneio):
+# Função para calcular o fitness de toda a população em uma única chamada
+def fitness_lote(populacao):
+    return FUNCOES['schaffers'](np.asarray(populacao))
+
+# Função para fazer a seleção dos pais (torneio), usando o fitness já calculado da população
+def selecao_torneio(populacao, tamanho_torneio, fitness_populacao):
     pais = []
     for _ in range(tamanho_torneio):
-        torneio = random.sample(populacao, tamanho_torneio)
-        torneio.sort(key=fitness, reverse=True)
-        pais.append(torneio[0])
+        torneio = random.sample(range(len(populacao)), tamanho_torneio)
+        pais.append(populacao[max(torneio, key=lambda i: fitness_populacao[i])])
     return pais
 
 # Função para cruzar dois indivíduos (crossover BLX‑α)
@@ -49,54 +56,288 @@ def mutacao(individuo, taxa_mutacao, sigma=1.0):
             individuo[i] = np.clip(individuo[i], -10, 10)
     return individuo
 
-# Função para criar a nova geração
-def nova_geracao(populacao, taxa_mutacao, tamanho_torneio):
-    populacao.sort(key=fitness, reverse=True)
-    elite = populacao[:2]  # Preserva os 2 melhores
-    
-    nova_populacao = elite.copy()
-    while len(nova_populacao) < len(populacao):
-        pais = selecao_torneio(populacao, tamanho_torneio)
+# Função para criar a nova geração a partir do fitness da população (calculado uma única vez por geração). Os 2 melhores
+# são escolhidos com seleção parcial (argpartition) em vez de ordenar a população e mantêm o fitness que já tinham:
+# só os filhos são avaliados, em uma única chamada. Devolve a nova população e o seu fitness
+def nova_geracao(populacao, fitness_populacao, taxa_mutacao, tamanho_torneio, avaliacao=fitness_lote, num_elite=2):
+    indices_elite = np.argpartition(fitness_populacao, -num_elite)[-num_elite:]
+    elite = [populacao[i] for i in indices_elite]  # Preserva os 2 melhores
+
+    filhos = []
+    while len(elite) + len(filhos) < len(populacao):
+        pais = selecao_torneio(populacao, tamanho_torneio, fitness_populacao)
         filho = recombinacao(pais[0], pais[1])
         filho_mutado = mutacao(filho, taxa_mutacao)
-        nova_populacao.append(filho_mutado)
-    
-    return nova_populacao
+        filhos.append(filho_mutado)
+
+    fitness_filhos = avaliacao(filhos) if filhos else np.empty(0)
+    return elite + filhos, np.concatenate((fitness_populacao[indices_elite], fitness_filhos))
+
+# Função principal do Algoritmo Genético. Não usa estado global: devolve a melhor solução e as curvas do melhor fitness
+# e do fitness médio de cada geração; populacoes_geracoes (HistoricoFrames, opcional) recebe as populações da execução.
+# populacao (opcional) é a população inicial, por exemplo para continuar uma execução; sem ela a população é sorteada.
+# avaliacao é a função de fitness em lote (por exemplo um contador de avaliações; ver cria_contador_avaliacoes).
+# fitness_populacao (opcional) é o fitness já conhecido da população inicial, que então não é avaliada de novo, e
+# fitness_geracoes (HistoricoFrames, opcional) recebe o fitness de cada geração, como populacoes_geracoes
+def algoritmo_genetico(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes=None, populacao=None, avaliacao=fitness_lote, num_dimensoes=2, fitness_populacao=None, fitness_geracoes=None):
+    melhores_fitness = []
+    fitness_medio = []
+    if populacao is None:
+        populacao = populacao_inicial(tamanho_populacao, num_dimensoes)
+    fitness_geracao = avaliacao(populacao) if fitness_populacao is None else np.asarray(fitness_populacao)
+
+    for geracao in range(num_geracoes):
+        populacao, fitness_geracao = nova_geracao(populacao, fitness_geracao, taxa_mutacao, tamanho_torneio, avaliacao)
+        # Salva a população da geração (conforme o intervalo do histórico)
+        if populacoes_geracoes is not None:
+            populacoes_geracoes.registra(geracao, populacao)
+        if fitness_geracoes is not None:
+            fitness_geracoes.registra(geracao, fitness_geracao)
+
+        # Fitness máximo e médio da população (reaproveita o fitness da nova geração)
+        melhores_fitness.append(np.max(fitness_geracao))
+        fitness_medio.append(np.mean(fitness_geracao))
+
+    if populacoes_geracoes is not None:
+        populacoes_geracoes.finaliza()
+    if fitness_geracoes is not None:
+        fitness_geracoes.finaliza()
+    melhor_solucao = populacao[np.argmax(fitness_geracao)]
+    return melhor_solucao, melhores_fitness, fitness_medio
+
+# Versão vetorizada em N dimensões: a população é uma matriz (indivíduos x dimensões) e cada etapa da geração opera
+# sobre ela inteira
+
+# Função para definir a população inicial (matriz, aleatoriamente)
+def populacao_inicial_vetorizada(tamanho_populacao, num_dimensoes=2):
+    return np.random.uniform(*DOMINIOS['schaffers'], (tamanho_populacao, num_dimensoes))
+
+# Função para aplicar mutação em todos os indivíduos (perturbação gaussiana nos genes sorteados, limitados ao domínio)
+def mutacao_vetorizada(populacao, taxa_mutacao, sigma=1.0):
+    mascara = np.random.random(populacao.shape) < taxa_mutacao
+    mutados = np.clip(populacao + np.random.normal(0, sigma, populacao.shape), *DOMINIOS['schaffers'])
+    return np.where(mascara, mutados, populacao)
+
+# Função para criar a nova geração (versão vetorizada): mesma elite por argpartition e mesma avaliação única dos filhos
+# da versão com listas
+def nova_geracao_vetorizada(populacao, fitness_populacao, taxa_mutacao, tamanho_torneio, avaliacao=fitness_lote, num_elite=2):
+    indices_elite = np.argpartition(fitness_populacao, -num_elite)[-num_elite:]
+    pares = selecao_torneio_vetorizada(fitness_populacao, len(populacao) - num_elite, tamanho_torneio)
+    filhos = recombinacao_blx_vetorizada(populacao[pares[:, 0]], populacao[pares[:, 1]])
+    filhos = mutacao_vetorizada(filhos, taxa_mutacao)
+    return np.vstack((populacao[indices_elite], filhos)), np.concatenate((fitness_populacao[indices_elite], avaliacao(filhos)))
+
+# Função principal do Algoritmo Genético (versão vetorizada, mesmas entradas e saídas da versão com listas)
+def algoritmo_genetico_vetorizado(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes=None, populacao=None, avaliacao=fitness_lote, num_dimensoes=2, fitness_populacao=None, fitness_geracoes=None):
+    melhores_fitness = []
+    fitness_medio = []
+    if populacao is None:
+        populacao = populacao_inicial_vetorizada(tamanho_populacao, num_dimensoes)
+    fitness_geracao = avaliacao(populacao) if fitness_populacao is None else np.asarray(fitness_populacao)
+
+    for geracao in range(num_geracoes):
+        populacao, fitness_geracao = nova_geracao_vetorizada(populacao, fitness_geracao, taxa_mutacao, tamanho_torneio, avaliacao)
+        # Salva a população da geração (conforme o intervalo do histórico)
+        if populacoes_geracoes is not None:
+            populacoes_geracoes.registra(geracao, populacao)
+        if fitness_geracoes is not None:
+            fitness_geracoes.registra(geracao, fitness_geracao)
+
+        # Fitness máximo e médio da população (reaproveita o fitness da nova geração)
+        melhores_fitness.append(np.max(fitness_geracao))
+        fitness_medio.append(np.mean(fitness_geracao))
 
-# Função principal do Algoritmo Genético
-def algoritmo_genetico(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio):
-    populacao = populacao_inicial(tamanho_populacao)
+    if populacoes_geracoes is not None:
+        populacoes_geracoes.finaliza()
+    if fitness_geracoes is not None:
+        fitness_geracoes.finaliza()
+    return populacao[np.argmax(fitness_geracao)], melhores_fitness, fitness_medio
 
-    for _ in range(num_geracoes):
-        populacao = nova_geracao(populacao, taxa_mutacao, tamanho_torneio)
-        # Salva a população de cada geração
-        populacoes_geracoes.append(populacao)
+# Mede o tempo médio por geração da versão vetorizada para cada número de dimensões e tamanho de população.
+# Combinações cuja memória estimada (algumas matrizes população x dimensões em float64) passa de limite_memoria_gb
+# são puladas
+def benchmark_dimensoes(lista_dimensoes, lista_tamanhos, num_geracoes=5, taxa_mutacao=0.2, tamanho_torneio=3, limite_memoria_gb=2, semente=0):
+    print(f"{'Dimensões':>9} {'População':>10} {'Tempo/geração (s)':>18} {'Indivíduos/s':>13}")
+    for num_dimensoes in lista_dimensoes:
+        for tamanho_populacao in lista_tamanhos:
+            if 8 * 8 * tamanho_populacao * num_dimensoes / 2**30 > limite_memoria_gb:
+                print(f"{num_dimensoes:>9} {tamanho_populacao:>10} {'-':>18} {'-':>13}")
+                continue
+            np.random.seed(semente)
+            populacao = populacao_inicial_vetorizada(tamanho_populacao, num_dimensoes)
+            fitness_geracao = fitness_lote(populacao)
+            inicio = time.perf_counter()
+            for _ in range(num_geracoes):
+                populacao, fitness_geracao = nova_geracao_vetorizada(populacao, fitness_geracao, taxa_mutacao, tamanho_torneio)
+            tempo = (time.perf_counter() - inicio) / num_geracoes
+            print(f"{num_dimensoes:>9} {tamanho_populacao:>10} {tempo:>18.4f} {tamanho_populacao / tempo:>13.0f}")
 
-        # Calcula o fitness máximo e médio da população
-        fitness_geracao = [fitness(individuo) for individuo in populacao]
-        melhores_fitness.append(max(fitness_geracao))
-        fitness_medio.append(sum(fitness_geracao) / len(fitness_geracao))
+# Modelo de ilhas: várias subpopulações evoluindo em paralelo (uma tarefa do pool de processos por ilha) que trocam
+# seus melhores indivíduos a cada intervalo_migracao gerações. As populações das ilhas ficam em um único array
+# (ilhas x indivíduos x dimensões) em memória compartilhada, ao lado do fitness de cada indivíduo (ilhas x indivíduos):
+# cada processo lê e escreve apenas a sua ilha e a migração é feita direto nos arrays, sem copiar as populações entre os
+# processos nem avaliá-las de novo
 
-    melhor_solucao = max(populacao, key=fitness)
-    return melhor_solucao
+# Executa algumas gerações de uma ilha em um processo do pool, partindo da população e do fitness guardados, e devolve
+# as curvas da época e o estado aleatório
+def executa_epoca_ilha(args):
+    (nome_ilhas, nome_fitness, forma_ilhas, ilha, num_geracoes, taxa_mutacao, tamanho_torneio, estado_random, estado_numpy, vetorizado, avaliacao) = args
+
+    def epoca(ilhas, fitness_ilhas):
+        # Cada ilha mantém suas próprias sequências aleatórias entre as épocas
+        random.setstate(estado_random)
+        np.random.set_state(estado_numpy)
+        populacao = ilhas[ilha].copy() if vetorizado else ilhas[ilha].tolist()
+        ultima_populacao = HistoricoFrames('anel', capacidade=1)  # Guarda só a população da última geração
+        ultimo_fitness = HistoricoFrames('anel', capacidade=1)  # e o fitness dela
+        algoritmo = algoritmo_genetico_vetorizado if vetorizado else algoritmo_genetico
+        _, melhores_fitness, fitness_medio = algoritmo(
+            len(populacao), num_geracoes, taxa_mutacao, tamanho_torneio, ultima_populacao, populacao, avaliacao,
+            fitness_populacao=fitness_ilhas[ilha].copy(), fitness_geracoes=ultimo_fitness)
+        ilhas[ilha] = ultima_populacao[-1]
+        fitness_ilhas[ilha] = ultimo_fitness[-1]
+        return melhores_fitness, fitness_medio, random.getstate(), np.random.get_state()
+
+    return executa_com_memoria_compartilhada(epoca, [(nome_ilhas, forma_ilhas, np.float64, False),
+                                                     (nome_fitness, forma_ilhas[:2], np.float64, False)])
+
+# Migração: cada ilha recebe os num_migrantes melhores indivíduos de outra ilha (com o fitness deles), que substituem
+# os seus piores. Em 'anel' a origem é a ilha anterior; em 'aleatoria' é sorteada a cada migração (sempre uma ilha
+# diferente, pelo gerador aleatório dado). Usa o fitness guardado em fitness_ilhas, sem avaliar as ilhas
+def migra(ilhas, fitness_ilhas, num_migrantes, migracao='anel', gerador=np.random):
+    num_ilhas = len(ilhas)
+    ordem = np.argsort(fitness_ilhas, axis=1)
+    melhores = ordem[:, -num_migrantes:]
+    piores = ordem[:, :num_migrantes]
+    if migracao == 'anel':
+        origens = (np.arange(num_ilhas) - 1) % num_ilhas
+    else:
+        origens = (np.arange(num_ilhas) + gerador.randint(1, num_ilhas, num_ilhas)) % num_ilhas
+    migrantes = ilhas[origens[:, None], melhores[origens]]  # Copiados antes de qualquer substituição
+    fitness_migrantes = fitness_ilhas[origens[:, None], melhores[origens]]
+    ilhas[np.arange(num_ilhas)[:, None], piores] = migrantes
+    fitness_ilhas[np.arange(num_ilhas)[:, None], piores] = fitness_migrantes
+
+# Algoritmo genético com modelo de ilhas: num_ilhas subpopulações de tamanho_populacao indivíduos. Devolve a melhor
+# solução, as curvas combinadas (melhor fitness entre as ilhas e média dos fitness médios das ilhas a cada geração) e
+# as curvas de cada ilha. populacoes_geracoes (opcional) recebe todas as ilhas juntas ao fim de cada época, com o
+# índice da época como iteração (o intervalo do histórico conta épocas, não gerações).
+# Com vetorizado=True cada ilha usa algoritmo_genetico_vetorizado; avaliacao precisa ser uma função de módulo (é
+# enviada aos processos do pool)
+def algoritmo_genetico_ilhas(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, num_ilhas, num_processos=None,
+                             intervalo_migracao=10, num_migrantes=2, migracao='anel', semente=None, populacoes_geracoes=None,
+                             num_dimensoes=2, vetorizado=False, avaliacao=fitness_lote):
+    if migracao not in ('anel', 'aleatoria'):
+        raise ValueError(f"Migração desconhecida: {migracao}")
+
+    gerador = np.random.RandomState(semente)
+    populacoes = gerador.uniform(*DOMINIOS['schaffers'], (num_ilhas, tamanho_populacao, num_dimensoes))
+    shm = cria_memoria_compartilhada(populacoes)
+    shm_fitness = cria_memoria_compartilhada(avaliacao(populacoes.reshape(-1, num_dimensoes)).reshape(num_ilhas, tamanho_populacao))
+    estados_random = [random.Random(None if semente is None else semente + i).getstate() for i in range(num_ilhas)]
+    estados_numpy = [np.random.RandomState(None if semente is None else semente + i).get_state() for i in range(num_ilhas)]
+    melhores_ilhas = [[] for _ in range(num_ilhas)]
+    medios_ilhas = [[] for _ in range(num_ilhas)]
+
+    def evolui(ilhas, fitness_ilhas):
+        with ProcessPoolExecutor(max_workers=num_processos) as pool:
+            geracao = 0
+            epoca = 0
+            while geracao < num_geracoes:
+                geracoes_epoca = min(intervalo_migracao, num_geracoes - geracao)
+                tarefas = [(shm.name, shm_fitness.name, ilhas.shape, i, geracoes_epoca, taxa_mutacao, tamanho_torneio, estados_random[i], estados_numpy[i], vetorizado, avaliacao)
+                           for i in range(num_ilhas)]
+                for i, (melhores, medios, estado_random, estado_numpy) in enumerate(pool.map(executa_epoca_ilha, tarefas)):
+                    melhores_ilhas[i].extend(melhores)
+                    medios_ilhas[i].extend(medios)
+                    estados_random[i], estados_numpy[i] = estado_random, estado_numpy
+                geracao += geracoes_epoca
+
+                if populacoes_geracoes is not None:
+                    populacoes_geracoes.registra(epoca, ilhas.reshape(-1, num_dimensoes))
+                epoca += 1
+                if num_ilhas > 1 and geracao < num_geracoes:
+                    migra(ilhas, fitness_ilhas, num_migrantes, migracao, gerador)
+
+        return ilhas.reshape(-1, num_dimensoes)[np.argmax(fitness_ilhas)].copy()
+
+    try:
+        melhor_solucao = executa_com_memoria_compartilhada(evolui, [(shm.name, populacoes.shape, np.float64, False),
+                                                                    (shm_fitness.name, populacoes.shape[:2], np.float64, False)])
+    finally:
+        libera_memoria_compartilhada(shm, shm_fitness)
+
+    if populacoes_geracoes is not None:
+        populacoes_geracoes.finaliza()
+    melhores_fitness = np.max(melhores_ilhas, axis=0).tolist()
+    fitness_medio = np.mean(medios_ilhas, axis=0).tolist()
+    return melhor_solucao, melhores_fitness, fitness_medio, melhores_ilhas
+
+# Compara tempo e qualidade do modelo de ilhas para diferentes números de processos (uma ilha por processo, mesmo
+# tamanho de ilha e número de gerações)
+def benchmark_ilhas(lista_num_processos, tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, intervalo_migracao, num_migrantes, semente=0):
+    print(f"{'Processos':>9} {'Ilhas':>6} {'Tempo (s)':>10} {'Melhor fitness':>15} {'Média das ilhas':>16}")
+    for num_processos in lista_num_processos:
+        inicio = time.perf_counter()
+        _, melhores_fitness, _, melhores_ilhas = algoritmo_genetico_ilhas(
+            tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, num_processos, num_processos,
+            intervalo_migracao, num_migrantes, semente=semente)
+        tempo = time.perf_counter() - inicio
+        media_ilhas = np.mean([melhores[-1] for melhores in melhores_ilhas])
+        print(f"{num_processos:>9} {num_processos:>6} {tempo:>10.2f} {melhores_fitness[-1]:>15.6f} {media_ilhas:>16.6f}")
 
 if __name__ == "__main__":
     # Definindo os parâmetros do algoritmo genético
-    num_dimensoes = 2
+    num_dimensoes = 2  # A animação mostra as duas primeiras variáveis
+    funcao = 'schaffers'  # 'schaffers' (F6 sobre a distância à origem) ou 'schaffers-expandida' (F6 em pares consecutivos)
+    vetorizado = True  # População em uma matriz NumPy (indivíduos x dimensões), geração inteira de uma vez
     tamanho_populacao = 200
     num_geracoes = 70
     taxa_mutacao = 0.2
     tamanho_torneio = 3
+    num_ilhas = 1  # Mais de uma ilha ativa o modelo de ilhas (subpopulações em paralelo, um processo por ilha)
+    intervalo_migracao = 10  # Gerações entre as migrações
+    num_migrantes = 2  # Melhores indivíduos enviados por ilha a cada migração
+    migracao = 'anel'  # 'anel' ou 'aleatoria'
+    # Histórico das populações para a animação: 'memoria', 'anel', 'memmap' ou 'npz' (ver historico_frames.py)
+    modo_historico = 'memoria'
+    intervalo_historico = 1  # Guarda uma população a cada intervalo_historico gerações (épocas no modelo de ilhas)
+    frames_anel = 20  # Modo 'anel': guarda só as últimas frames_anel populações
+
+    # Benchmark do modelo de ilhas por número de processos: python algoritmo-genetico.py benchmark-ilhas
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark-ilhas':
+        lista_num_processos = sorted({1, 2, 4, os.cpu_count()})
+        benchmark_ilhas(lista_num_processos, tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, intervalo_migracao, num_migrantes)
+        sys.exit()
+
+    # Tempo por geração da versão vetorizada por dimensões e tamanho da população: python algoritmo-genetico.py benchmark-dimensoes
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark-dimensoes':
+        benchmark_dimensoes([2, 10, 100, 1000], [100, 1000, 10000, 100000], taxa_mutacao=taxa_mutacao, tamanho_torneio=tamanho_torneio)
+        sys.exit()
+
+    arquivo_historico = 'historico_populacoes.npz' if modo_historico == 'npz' else 'historico_populacoes.npy'
+    capacidade_historico = frames_anel if modo_historico == 'anel' else num_geracoes // intervalo_historico + 1
+    populacoes_geracoes = HistoricoFrames(modo_historico, intervalo_historico, capacidade_historico, arquivo_historico)
 
     inicio = time.time() # marca o tempo de execução
 
     # Executando o algoritmo genético
-    melhor_solucao = algoritmo_genetico(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio)
+    funcao_objetivo = obtem_funcao(funcao)
+    if num_ilhas > 1:
+        melhor_solucao, melhores_fitness, fitness_medio, _ = algoritmo_genetico_ilhas(
+            tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, num_ilhas, intervalo_migracao=intervalo_migracao,
+            num_migrantes=num_migrantes, migracao=migracao, populacoes_geracoes=populacoes_geracoes,
+            num_dimensoes=num_dimensoes, vetorizado=vetorizado, avaliacao=funcao_objetivo)
+    else:
+        avaliacao = cria_contador_avaliacoes(funcao_objetivo)
+        algoritmo = algoritmo_genetico_vetorizado if vetorizado else algoritmo_genetico
+        melhor_solucao, melhores_fitness, fitness_medio = algoritmo(tamanho_populacao, num_geracoes, taxa_mutacao, tamanho_torneio, populacoes_geracoes, avaliacao=avaliacao, num_dimensoes=num_dimensoes)
+        print(f"Avaliações de fitness: {avaliacao.total} (população inicial + {tamanho_populacao - 2} filhos por geração)")
 
     fim = time.time() # marca o tempo de execução
 
     melhor_solucao = np.round(melhor_solucao, 4)
-    print(f"A maximização de f(x, y) = {schaffers(melhor_solucao):.4f} no ponto x*={melhor_solucao}")
+    print(f"A maximização de f(x) = {funcao_objetivo(melhor_solucao):.4f} (n = {num_dimensoes}) no ponto x*={melhor_solucao}")
     print(f"Tempo de execução: {fim - inicio:.4f} segundos")
 
     # Gerar o vídeo da convergência com os indivíduos ao longo das gerações
@@ -134,12 +375,15 @@ if __name__ == "__main__":
         x = [ind[0] for ind in ger]
         y = [ind[1] for ind in ger]
         pontos.set_data(x, y)
-        ax.set_title(f'Geração {frame+1} de {num_geracoes}')
+        if num_ilhas > 1:
+            ax.set_title(f'Época {populacoes_geracoes.iteracoes[frame]+1} de {-(-num_geracoes // intervalo_migracao)}')
+        else:
+            ax.set_title(f'Geração {populacoes_geracoes.iteracoes[frame]+1} de {num_geracoes}')
         return pontos,
 
     # Cria e salva a animação
     anim = FuncAnimation(fig, atualizar,
-                        frames=num_geracoes,
+                        frames=len(populacoes_geracoes),
                         interval=200,
                         blit=False)
     anim.save('evolucao_com_contornos.mp4', writer='ffmpeg', dpi=200)
@@ -0,0 +1,43 @@
+# Funções auxiliares usadas por vários scripts: memória compartilhada entre os processos dos modelos de ilhas e
+# multi-início (caixeiro-viajante/ant-colony.py, schaffers-maximizacao/algoritmo-genetico.py,
+# classificacao-flores-iris/clonalg.py) e contagem de avaliações da função objetivo
+from multiprocessing import shared_memory
+import numpy as np
+
+# Função para contar as avaliações: envolve a função de avaliação em lote e soma o número de itens avaliados
+# em contador.total
+def cria_contador_avaliacoes(avaliacao):
+    def contador(lote):
+        contador.total += len(lote)
+        return avaliacao(lote)
+
+    contador.total = 0
+    return contador
+
+# Copia um array para um bloco de memória compartilhada e devolve o bloco (o array pode ser lido pelo nome do bloco)
+def cria_memoria_compartilhada(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+# Abre os blocos de memória compartilhada, cada um dado por (nome, forma, dtype, somente_leitura), chama funcao com
+# um array sobre cada bloco (na mesma ordem) e fecha os blocos no fim. funcao não pode guardar nem devolver
+# referências a esses arrays (o resultado precisa ser uma cópia)
+def executa_com_memoria_compartilhada(funcao, blocos):
+    shms = [shared_memory.SharedMemory(name=nome) for nome, _, _, _ in blocos]
+    try:
+        arrays = [np.ndarray(forma, dtype=dtype, buffer=shm.buf) for shm, (_, forma, dtype, _) in zip(shms, blocos)]
+        for i, (_, _, _, somente_leitura) in enumerate(blocos):
+            arrays[i].flags.writeable = not somente_leitura
+        resultado = funcao(*arrays)
+        del arrays  # Libera as referências à memória compartilhada antes de fechá-la
+        return resultado
+    finally:
+        for shm in shms:
+            shm.close()
+
+# Fecha e remove os blocos criados por cria_memoria_compartilhada (no processo que os criou)
+def libera_memoria_compartilhada(*shms):
+    for shm in shms:
+        shm.close()
+        shm.unlink()